@@ -22,7 +22,9 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = await auth_service.get_user_by_id(int(user_id))
+    user = auth_service.user_from_claims(payload) if auth_service.AUTH_TRUSTED_CLAIMS else None
+    if user is None:
+        user = await auth_service.get_user_by_id(int(user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
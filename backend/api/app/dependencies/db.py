@@ -0,0 +1,27 @@
+from functools import wraps
+
+from shared.db import force_primary, unit_of_work
+
+
+async def read_from_primary():
+    """Serve every read of the request from the primary (read-after-write consistency)."""
+    force_primary()
+
+
+def single_transaction(endpoint):
+    """Run the shared functions of the endpoint on one connection and commit once at the end.
+
+    Applied as a decorator below the route so the commit happens before the response is sent
+    (yield-dependency teardown runs after it on recent FastAPI versions): a client reading right
+    away sees its write, and a failed commit surfaces as an error response.
+
+    Errors (including HTTPException) roll back every write of the request. The connection is
+    held for the whole handler, so keep it to endpoints chaining several queries.
+    """
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        async with unit_of_work():
+            return await endpoint(*args, **kwargs)
+
+    return wrapper
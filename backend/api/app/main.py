@@ -5,13 +5,19 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from shared.db import close_async_pool, get_async_cursor, open_async_pool
+from helper.redis import close_redis_clients
+from shared.db import close_async_pool, get_async_cursor, get_pool_stats, get_replica_state, open_async_pool
+from shared.metrics import render_metrics
 
+from .middleware.timing import TimingMiddleware
 from .routers.auth import router as auth_router
 from .routers.scheduler import router as scheduler_router
 from .routers.matches import router as matches_router
 from .routers.users import router as users_router
+from .services.live import live_hub
+from .services.passwords import password_hasher_stats, shutdown_password_hasher
 
 
 logger = logging.getLogger("uvicorn.error")
@@ -38,6 +44,9 @@ async def lifespan(app: FastAPI):
             logger.info("Host IP not set (HOST_IP env missing)")
         yield
     finally:
+        await live_hub.close()
+        shutdown_password_hasher()
+        await close_redis_clients()
         await close_async_pool()
 
 
@@ -55,6 +64,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TimingMiddleware)
 
 
 @app.get("/health")
@@ -71,7 +81,28 @@ async def healthcheck():
         db_error = str(exc)
         logger.exception("Database healthcheck failed")
 
-    response = {"status": "ok", "database": db_status}
+    pool_stats = get_pool_stats()
+    response = {
+        "status": "ok",
+        "database": db_status,
+        "database_pool": {
+            "size": pool_stats.get("pool_size", 0),
+            "max": pool_stats.get("pool_max", 0),
+            "in_use": pool_stats["in_use"],
+            "available": pool_stats.get("pool_available", 0),
+            "waiting": pool_stats.get("requests_waiting", 0),
+            "errors": pool_stats.get("requests_errors", 0) + pool_stats.get("connections_errors", 0),
+            "timeouts": pool_stats.get("requests_timeouts", 0),
+        },
+        "database_replica": get_replica_state(),
+        "password_hasher": password_hasher_stats(),
+    }
     if db_error:
         response["database_error"] = db_error
     return response
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the request and database metrics of this process."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
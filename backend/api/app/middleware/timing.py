@@ -0,0 +1,85 @@
+import time
+
+from shared.metrics import COUNT_BUCKETS, counter, end_request_db_stats, histogram, start_request_db_stats
+
+REQUEST_SECONDS = histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route template.",
+    ("method", "route", "status"),
+)
+# SSE connections stay open for minutes; keeping them out of the request histogram stops them
+# from dominating its upper buckets.
+STREAM_SECONDS = histogram(
+    "http_stream_duration_seconds",
+    "Lifetime of streaming (text/event-stream) responses by route template.",
+    ("method", "route", "status"),
+    buckets=(1.0, 10.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0),
+)
+REQUEST_DB_QUERIES = histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per HTTP request.",
+    ("method", "route"),
+)
+REQUEST_POOL_WAIT_SECONDS = histogram(
+    "http_request_db_pool_wait_seconds",
+    "Time spent waiting for pooled connections per HTTP request.",
+    ("method", "route"),
+)
+REQUESTS_TOTAL = counter("http_requests_total", "HTTP requests by route template.", ("method", "route", "status"))
+
+
+def _is_event_stream(headers) -> bool:
+    for name, value in headers:
+        if name.lower() == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"text/event-stream"
+    return False
+
+
+def _route_template(scope) -> str:
+    # Route templates (e.g. /matches/{match_id}) keep label cardinality bounded.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware: per-route latency plus per-request DB query count, time and pool wait."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = _is_event_stream(message.get("headers", ()))
+            await send(message)
+
+        stats, token = start_request_db_stats()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            end_request_db_stats(token)
+            method = scope["method"]
+            route = _route_template(scope)
+            duration_metric = STREAM_SECONDS if streaming else REQUEST_SECONDS
+            duration_metric.observe(elapsed, method, route, str(status_code))
+            REQUESTS_TOTAL.inc(method, route, str(status_code))
+            REQUEST_DB_QUERIES.observe(stats["queries"], method, route)
+            REQUEST_DB_SECONDS.observe(stats["query_seconds"], method, route)
+            REQUEST_POOL_WAIT_SECONDS.observe(stats["pool_wait_seconds"], method, route)
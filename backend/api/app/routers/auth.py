@@ -4,6 +4,7 @@ from ..dependencies.auth import get_current_user
 from ..schemas.auth import LoginRequest, SignupRequest, TokenResponse, UserResponse, UserWithPersonResponse
 from shared.persons import get_person
 from ..services import auth as auth_service
+from ..services.passwords import PasswordHasherBusy
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -22,6 +23,8 @@ async def signup(payload: SignupRequest):
         return user
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    except PasswordHasherBusy as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -30,6 +33,8 @@ async def login(payload: LoginRequest):
         return await auth_service.login(payload.email, payload.password)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    except PasswordHasherBusy as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
 
 
 @router.get("/me", response_model=UserWithPersonResponse)
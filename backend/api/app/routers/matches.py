@@ -1,47 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from ..dependencies.auth import get_current_user
 from ..schemas.auth import UserResponse
-from ..schemas.match import MatchPreviewResponse, MatchResponse
+from ..schemas.match import MatchPreviewPageResponse, MatchPreviewResponse, MatchResponse
+from ..services.etag import compute_etag, is_not_modified, not_modified_response, set_etag
+from ..services.live import event_stream
+from shared.cache import PREVIEWS_SCOPE, TEAMS_SCOPE, division_scope, match_scope
+from shared.live import division_channel, match_channel
 from shared.matches import get_match_details as fetch_match_details
-from shared.matches import get_match_previews
+from shared.matches import get_match_previews, get_match_previews_page
 from shared.rankings import get_rankings_view
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _preview_response(row: dict) -> dict:
+    return {
+        "id": row["id"],
+        "division": row["division"],
+        "status": row["status"],
+        "home_team": row["home_team"],
+        "away_team": row["away_team"],
+        "home_score": row["home_score"],
+        "away_score": row["away_score"],
+        "start_time": row["start_time"].isoformat()
+        if row.get("start_time") and hasattr(row["start_time"], "isoformat")
+        else None,
+        "home_primary_color": row["home_primary_color"],
+        "home_secondary_color": row["home_secondary_color"],
+        "away_primary_color": row["away_primary_color"],
+        "away_secondary_color": row["away_secondary_color"],
+    }
+
 
 @router.get("/previews", response_model=list[MatchPreviewResponse])
-async def list_match_previews():
+async def list_match_previews(request: Request, response: Response):
+    etag = await compute_etag(PREVIEWS_SCOPE, TEAMS_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
     rows = await get_match_previews()
-    return [
-        {
-            "id": row["id"],
-            "division": row["division"],
-            "status": row["status"],
-            "home_team": row["home_team"],
-            "away_team": row["away_team"],
-            "home_score": row["home_score"],
-            "away_score": row["away_score"],
-            "start_time": row["start_time"].isoformat()
-            if row.get("start_time") and hasattr(row["start_time"], "isoformat")
-            else None,
-            "home_primary_color": row["home_primary_color"],
-            "home_secondary_color": row["home_secondary_color"],
-            "away_primary_color": row["away_primary_color"],
-            "away_secondary_color": row["away_secondary_color"],
-        }
-        for row in rows
-    ]
+    set_etag(response, etag)
+    return [_preview_response(row) for row in rows]
+
+
+@router.get("/previews/page", response_model=MatchPreviewPageResponse)
+async def list_match_previews_page(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    division: int | None = None,
+    match_status: str | None = Query(None, alias="status"),
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+):
+    etag = await compute_etag(PREVIEWS_SCOPE, TEAMS_SCOPE, variant=str(request.url.query))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    try:
+        page = await get_match_previews_page(
+            limit=limit,
+            cursor=cursor,
+            division=division,
+            status=match_status,
+            team_id=team_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    set_etag(response, etag)
+    return {
+        "items": [_preview_response(row) for row in page["items"]],
+        "next_cursor": page["next_cursor"],
+    }
 
 @router.get("/rankings/{division}")
-async def list_rankings(division: int):
-    return await get_rankings_view(division)
+async def list_rankings(division: int, request: Request, response: Response):
+    # Same version as the cached view: team changes shown in standings bump the division scope.
+    etag = await compute_etag(division_scope(division))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    rankings = await get_rankings_view(division)
+    set_etag(response, etag)
+    return rankings
+
+@router.get("/live/division/{division}")
+async def stream_division_events(division: int, request: Request):
+    return StreamingResponse(
+        event_stream(request, division_channel(division)),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/{match_id}/live")
+async def stream_match_events(match_id: int, request: Request):
+    return StreamingResponse(
+        event_stream(request, match_channel(match_id)),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
 
 @router.get("/{match_id}", response_model=MatchResponse)
-async def get_match_details(match_id: int, current_user: UserResponse = Depends(get_current_user)):
+async def get_match_details(
+    match_id: int,
+    request: Request,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    etag = await compute_etag(match_scope(match_id), TEAMS_SCOPE)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
     row = await fetch_match_details(match_id)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match not found")
+    set_etag(response, etag)
     return {
         "id": row["id"],
         "division": row["division"],
@@ -1,18 +1,26 @@
 import os
 from helper.redis import SCHEDULER_JOB_ID, _ACTIVE_STATUSES, _get_queue
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from redis import Redis
 from rq import Queue
 from rq.job import Job
 
-from worker.tasks.scheduler import run_scheduler_job
+from worker.tasks.scheduler import run_scheduler_job, scheduler_job_options
 
 
 router = APIRouter(prefix="/scheduler", tags=["schedule"])
 
 
 @router.post("/run", status_code=status.HTTP_202_ACCEPTED)
-async def run_schedule():
+async def run_schedule(
+    mode: str = Query("indexed"),
+    engine: str = Query("rounds"),
+    time_budget: float | None = Query(None, description="Engine wall-clock budget in seconds."),
+):
+    try:
+        options = scheduler_job_options(mode, engine, time_budget)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     queue = _get_queue()
     try:
         existing_job = Job.fetch(SCHEDULER_JOB_ID, connection=queue.connection)
@@ -28,7 +36,7 @@ async def run_schedule():
             )
         existing_job.delete()
 
-    job = queue.enqueue(run_scheduler_job, job_id=SCHEDULER_JOB_ID)
+    job = queue.enqueue(run_scheduler_job, job_id=SCHEDULER_JOB_ID, **options)
     return {"job_id": job.id, "status": "queued"}
 
 
@@ -45,5 +53,6 @@ async def get_schedule_status():
         "enqueued_at": job.enqueued_at,
         "started_at": job.started_at,
         "ended_at": job.ended_at,
+        "progress": job.meta.get("progress"),
         "result": job.result,
     }
@@ -1,6 +1,6 @@
 ﻿
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from shared.players import (
     create_player,
@@ -8,6 +8,7 @@ from shared.players import (
     list_available_players,
 )
 from ..schemas.player import PlayerAddRequest
+from ..dependencies.db import read_from_primary, single_transaction
 from ..dependencies.auth import require_role
 from ..schemas.auth import RoleKeyRequest, RoleKeyResponse, UserResponse
 from ..schemas.match import (
@@ -77,7 +78,7 @@ from shared.venues import add_venue, list_venues, update_venue, delete_venue, li
 
 from helper.players import populate_players
 
-from worker.tasks.scheduler import run_scheduler_job
+from worker.tasks.scheduler import run_scheduler_job, scheduler_job_options
 from worker.tasks.matchGeneretor import run_generate_matches_job
 from helper.redis import MATCHES_GEN_JOB_ID, SCHEDULER_JOB_ID, _ACTIVE_STATUSES, _get_queue
 
@@ -87,7 +88,8 @@ from rq import Queue
 from rq.job import Job
 
 
-router = APIRouter(prefix="/user", tags=["user"])
+# Admin console and account pages read what they just wrote: never route them to the replica.
+router = APIRouter(prefix="/user", tags=["user"], dependencies=[Depends(read_from_primary)])
 
 
 #=========== MANAGER ===========#
@@ -109,7 +111,12 @@ async def get_team(current_user: UserResponse = Depends(require_role("MANAGER"))
         "players": team.get("players", []),
     }
 
-@router.post("/manager/team", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/manager/team",
+    response_model=TeamResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+@single_transaction
 async def add_team(
     payload: TeamAddRequest,
     current_user: UserResponse = Depends(require_role("MANAGER")),
@@ -137,6 +144,7 @@ async def add_team(
 
 
 @router.put("/manager/team", response_model=TeamResponse)
+@single_transaction
 async def update_team_info(
     payload: TeamUpdateRequest,
     current_user: UserResponse = Depends(require_role("MANAGER")),
@@ -169,6 +177,7 @@ async def update_team_info(
     }
 
 @router.post("/manager/team/players", status_code=status.HTTP_201_CREATED)
+@single_transaction
 async def add_team_player(
     payload: PlayerAddRequest,
     current_user: UserResponse = Depends(require_role("MANAGER")),
@@ -192,6 +201,7 @@ async def add_team_player(
 
 
 @router.delete("/manager/team/players/{player_id}")
+@single_transaction
 async def remove_team_player(
     player_id: int,
     current_user: UserResponse = Depends(require_role("MANAGER")),
@@ -646,8 +656,15 @@ async def create_role_key_endpoint(
 
 @router.post("/admin/scheduler/run")
 async def scheduler_endpoint(
+    mode: str = Query("indexed"),
+    engine: str = Query("rounds"),
+    time_budget: float | None = Query(None, description="Engine wall-clock budget in seconds."),
     current_user: UserResponse = Depends(require_role("ADMIN")),
 ):
+    try:
+        options = scheduler_job_options(mode, engine, time_budget)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     queue = _get_queue()
     try:
         existing_job = Job.fetch(SCHEDULER_JOB_ID, connection=queue.connection)
@@ -663,7 +680,7 @@ async def scheduler_endpoint(
             )
         existing_job.delete()
 
-    job = queue.enqueue(run_scheduler_job, job_id=SCHEDULER_JOB_ID)
+    job = queue.enqueue(run_scheduler_job, job_id=SCHEDULER_JOB_ID, **options)
     return {"job_id": job.id, "status": "queued"}
 
 
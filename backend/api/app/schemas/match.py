@@ -30,6 +30,11 @@ class MatchPreviewResponse(BaseModel):
     away_secondary_color: str
 
 
+class MatchPreviewPageResponse(BaseModel):
+    items: list[MatchPreviewResponse]
+    next_cursor: Optional[str] = None
+
+
 class MatchResponse(BaseModel):
     id: int
     division: int
@@ -3,13 +3,17 @@ import os
 from datetime import datetime, timedelta, timezone
 
 import jwt
-from passlib.hash import argon2
 
 from shared import users 
+from shared.cache import cache_get, cache_set
+from .passwords import hash_password, verify_password
 
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-me")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRES_MINUTES = int(os.getenv("JWT_EXPIRES_MINUTES", "60"))
+# Trusted-claims mode authorizes from the token alone: no DB lookup per request, but a deactivated
+# user or a role change only takes effect when the token expires (JWT_EXPIRES_MINUTES).
+AUTH_TRUSTED_CLAIMS = os.getenv("AUTH_TRUSTED_CLAIMS", "false").lower() in {"1", "true", "yes"}
 
 
 def _build_user_dict(raw: dict) -> dict:
@@ -31,9 +35,6 @@ async def signup(
     roles: list[str],
     role_keys: dict[str, str] | None = None,
 ):
-    if await users.get_user_by_email(email):
-        raise ValueError("Email already used")
-    password_hash = argon2.hash(password)
     normalized = [r.upper() for r in roles]
 
     if users.UserRoles.ADMIN.value in normalized:
@@ -45,29 +46,20 @@ async def signup(
     role_keys = role_keys or {}
 
     needs_key = {users.UserRoles.MANAGER.value, users.UserRoles.REFEREE.value}
+    required_keys = {}
     for role in normalized:
         if role in needs_key:
             if role not in role_keys:
                 raise ValueError(f"Missing role key for {role}")
+            required_keys[role] = role_keys[role]
 
-    from shared.role_keys import is_role_key_available, mark_role_key_used
-
-    for role in normalized:
-        if role in needs_key:
-            token = role_keys.get(role, "")
-            if not await is_role_key_available(role, token):
-                raise ValueError(f"Invalid or used role key for {role}")
-
-    user = await users.create_user(first_name, last_name, email, password_hash, normalized)
-
-    for role in normalized:
-        if role in needs_key:
-            token = role_keys.get(role, "")
-            marked = await mark_role_key_used(role, token, user["id"])
-            if not marked:
-                raise ValueError(f"Role key already used for {role}")
-
-    return user
+    # Cheap check before the expensive hash; the insert's ON CONFLICT still guards concurrent signups.
+    if await users.get_user_by_email(email):
+        raise ValueError("Email already used")
+    password_hash = await hash_password(password)
+    return await users.create_user_with_role_keys(
+        first_name, last_name, email, password_hash, normalized, required_keys
+    )
 
 
 def create_access_token(user: dict) -> str:
@@ -77,6 +69,7 @@ def create_access_token(user: dict) -> str:
         "email": user["email"],
         "person_id": user.get("person_id"),
         "roles": user.get("roles", []),
+        "created_at": user["created_at"].isoformat() if user.get("created_at") else None,
         "exp": expires,
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
@@ -97,7 +90,7 @@ async def login(email: str, password: str):
         raise ValueError("Invalid credentials")
     if not user.get("is_active"):
         raise ValueError("User is inactive")
-    if not argon2.verify(password, user.get("password_hash", "")):
+    if not await verify_password(password, user.get("password_hash", "")):
         raise ValueError("Invalid credentials")
 
     user_dict = {
@@ -114,13 +107,38 @@ async def login(email: str, password: str):
             "email": user["email"],
             "person_id": user.get("person_id"),
             "roles": user.get("roles", []),
+            "created_at": user["created_at"],
         }
     )
     return {"access_token": token, "token_type": "bearer", "user": user_dict}
 
 
+def _parse_created_at(value):
+    # Redis round-trips the user as JSON (datetime -> str); callers always get a datetime.
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
 async def get_user_by_id(user_id: int):
+    cached = await cache_get(users.user_cache_key(user_id))
+    if cached is not None:
+        return {**cached, "created_at": _parse_created_at(cached.get("created_at"))}
     raw = await users.get_user_by_id_with_roles(user_id)
     if not raw:
         return None
-    return _build_user_dict(raw)
+    user = _build_user_dict(raw)
+    await cache_set(users.user_cache_key(user_id), user, users.USER_CACHE_TTL_SECONDS)
+    return dict(user)
+
+
+def user_from_claims(payload: dict) -> dict | None:
+    """User dict rebuilt from a token issued by create_access_token, or None for older tokens."""
+    if not payload.get("created_at"):
+        return None
+    return {
+        "id": int(payload["sub"]),
+        "email": payload.get("email"),
+        "is_active": True,
+        "created_at": _parse_created_at(payload["created_at"]),
+        "person_id": payload.get("person_id"),
+        "roles": payload.get("roles", []),
+    }
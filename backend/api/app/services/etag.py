@@ -0,0 +1,52 @@
+import hashlib
+import time
+
+from fastapi import Request, Response, status
+
+from shared.cache import get_version_info
+from shared.db import DB_REPLICA_MAX_LAG_SECONDS, force_primary
+
+
+async def compute_etag(*scopes: str, variant: str = "") -> str | None:
+    """Weak ETag derived from the version counters of the scopes the response depends on.
+
+    variant distinguishes responses built from the same scopes (e.g. query parameters of a page).
+    Returns None when the versions are unavailable; the response is then served without an ETag.
+    A scope changed less than DB_REPLICA_MAX_LAG_SECONDS ago is read from the primary, so a
+    lagging replica never pairs the new tag with the old data.
+    """
+    tag, changed_at = await get_version_info(*scopes)
+    if time.time() - changed_at < DB_REPLICA_MAX_LAG_SECONDS:
+        force_primary()
+    if tag is None:
+        return None
+    digest = hashlib.sha1(f"{variant}|{'|'.join(scopes)}|{tag}".encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _strip_weak(value: str) -> str:
+    value = value.strip()
+    return value[2:] if value.startswith("W/") else value
+
+
+def is_not_modified(request: Request, etag: str | None) -> bool:
+    if etag is None:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = _strip_weak(etag)
+    return any(_strip_weak(candidate) == current for candidate in header.split(","))
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str | None):
+    if etag is None:
+        return
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+
+from shared.cache import get_redis
+from shared.live import LIVE_CHANNEL_PREFIX, add_local_handler, remove_local_handler
+
+logger = logging.getLogger("uvicorn.error")
+
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "100"))
+LIVE_KEEPALIVE_SECONDS = float(os.getenv("LIVE_KEEPALIVE_SECONDS", "15"))
+_RECONNECT_DELAY_SECONDS = 1.0
+
+
+class LiveHub:
+    """One Redis pattern subscription per API process, fanned out to per-client queues.
+
+    Clients get bounded queues; a client that falls behind loses its oldest events rather than
+    slowing down the reader or the other clients.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._reader: asyncio.Task | None = None
+        self._local = False
+
+    def _ensure_started(self):
+        if self._reader is not None or self._local:
+            return
+        if get_redis() is None:
+            add_local_handler(self.dispatch)
+            self._local = True
+            return
+        self._reader = asyncio.create_task(self._read_forever())
+
+    async def _read_forever(self):
+        redis = get_redis()
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{LIVE_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    self.dispatch(message["channel"].decode(), message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live subscription lost, reconnecting")
+                await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def dispatch(self, channel: str, data: str):
+        for queue in self._subscribers.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(data)
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        self._ensure_started()
+        queue = asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+        self._subscribers.setdefault(channel, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(channel)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[channel]
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def close(self):
+        if self._local:
+            remove_local_handler(self.dispatch)
+            self._local = False
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+
+
+live_hub = LiveHub()
+
+
+async def event_stream(request, channel: str):
+    """Server-sent events for one channel, with keepalive comments so proxies keep the connection open."""
+    queue = live_hub.subscribe(channel)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            if await request.is_disconnected():
+                break
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"data: {data}\n\n"
+    finally:
+        live_hub.unsubscribe(channel, queue)
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import argon2
+
+# argon2 is CPU-bound for tens of milliseconds per call; it runs on a small dedicated pool so the
+# event loop keeps serving other requests. Calls beyond workers + max pending are rejected.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
+
+_executor: ThreadPoolExecutor | None = None
+_stats_lock = threading.Lock()
+_stats = {
+    "in_flight": 0,
+    "running": 0,
+    "completed": 0,
+    "rejected": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+    "run_seconds_total": 0.0,
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+    return _executor
+
+
+def _timed(fn, submitted_at: float, *args):
+    started_at = time.perf_counter()
+    wait = started_at - submitted_at
+    with _stats_lock:
+        _stats["running"] += 1
+    try:
+        return fn(*args)
+    finally:
+        with _stats_lock:
+            _stats["running"] -= 1
+            _stats["wait_seconds_total"] += wait
+            _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], wait)
+            _stats["run_seconds_total"] += time.perf_counter() - started_at
+
+
+async def _run(fn, *args):
+    if _stats["in_flight"] >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_PENDING:
+        _stats["rejected"] += 1
+        raise PasswordHasherBusy("Too many password operations in progress")
+    _stats["in_flight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), _timed, fn, time.perf_counter(), *args)
+    finally:
+        _stats["in_flight"] -= 1
+        _stats["completed"] += 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(argon2.hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await _run(argon2.verify, password, password_hash)
+
+
+def password_hasher_stats() -> dict:
+    completed = _stats["completed"]
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+        "in_flight": _stats["in_flight"],
+        "queued": max(_stats["in_flight"] - _stats["running"], 0),
+        "completed": completed,
+        "rejected": _stats["rejected"],
+        "avg_wait_ms": _stats["wait_seconds_total"] * 1000 / completed if completed else 0.0,
+        "max_wait_ms": _stats["wait_seconds_max"] * 1000,
+        "avg_run_ms": _stats["run_seconds_total"] * 1000 / completed if completed else 0.0,
+    }
+
+
+def shutdown_password_hasher():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,38 @@
+import asyncio
+import statistics
+import time
+from contextlib import asynccontextmanager
+
+from shared.db import close_async_pool, open_async_pool
+
+
+@asynccontextmanager
+async def bench_pool():
+    await open_async_pool()
+    try:
+        yield
+    finally:
+        await close_async_pool()
+
+
+async def measure(call, args_list: list, calls: int, concurrency: int = 1):
+    """Run call calls times, cycling through args_list; concurrency=1 gives latency without pool contention."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(*args_list[i % len(args_list)])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "mean_ms": statistics.fmean(latencies),
+        "throughput_rps": calls / elapsed,
+    }
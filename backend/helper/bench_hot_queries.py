@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+
+from helper.bench import bench_pool, measure
+from shared.db import DB_PIPELINE, DB_PREPARE_THRESHOLD, get_async_pool
+from shared.matches import get_home_and_away_teams_from_match_id
+from shared.slots import are_parallel_matches_possible, get_match_at_slot, get_matches_sloted_at_same_time
+from shared.teams import list_team_players
+from shared.users import get_user_by_id_with_roles
+
+
+async def _sequential_parallel_check(slot, h_team_id, a_team_id):
+    # Previous access pattern: one round trip per parallel match and per roster.
+    parallel_matches = await get_matches_sloted_at_same_time(slot["id"], slot["start_time"], slot["end_time"])
+    if not parallel_matches:
+        return True
+    for parallel_match in parallel_matches:
+        teams = await get_home_and_away_teams_from_match_id(parallel_match["match_id"])
+        if h_team_id in teams or a_team_id in teams:
+            return False
+    our_ids = {player["id"] for player in await list_team_players(h_team_id)}
+    our_ids |= {player["id"] for player in await list_team_players(a_team_id)}
+    for parallel_match in parallel_matches:
+        teams = await get_home_and_away_teams_from_match_id(parallel_match["match_id"])
+        for team_id in teams:
+            if our_ids & {player["id"] for player in await list_team_players(team_id)}:
+                return False
+    return True
+
+
+async def _pick_samples(count: int):
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT s.id, s.start_time, s.end_time, m.id, m.home_team_id, m.away_team_id
+            FROM match_slot ms
+            JOIN slots s ON s.id = ms.slot_id
+            JOIN matches m ON m.id = ms.match_id
+            ORDER BY s.id
+            LIMIT %s
+            """,
+            (count,),
+        )
+        slots = await cur.fetchall()
+        await cur.execute("SELECT id FROM users ORDER BY id LIMIT %s", (count,))
+        users = [row[0] for row in await cur.fetchall()]
+    return slots, users
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Per-call latency of the hot lookups. Run it once as is and once with "
+            "DB_PREPARE_THRESHOLD=off to compare prepared and unprepared statements."
+        )
+    )
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=50, help="Number of distinct rows to cycle through.")
+    args = parser.parse_args()
+
+    async with bench_pool():
+        slots, users = await _pick_samples(args.samples)
+        if not slots or not users:
+            print("Need scheduled matches and users in the database")
+            return
+        print(f"prepare_threshold={DB_PREPARE_THRESHOLD} pipeline={DB_PIPELINE}")
+        # Probe each scheduled slot with its own teams, as the scheduler does.
+        parallel_args = [
+            ({"id": row[0], "start_time": row[1], "end_time": row[2]}, row[4], row[5]) for row in slots
+        ]
+        cases = (
+            ("get_home_and_away_teams_from_match_id", get_home_and_away_teams_from_match_id, [(row[3],) for row in slots]),
+            ("get_match_at_slot", get_match_at_slot, [(row[0],) for row in slots]),
+            ("get_user_by_id_with_roles", get_user_by_id_with_roles, [(user_id,) for user_id in users]),
+            ("parallel_check_sequential", _sequential_parallel_check, parallel_args),
+            ("parallel_check_pipelined", are_parallel_matches_possible, parallel_args),
+        )
+        for name, call, args_list in cases:
+            result = await measure(call, args_list, args.calls)
+            print(
+                f"{name:>38}: p50={result['p50_ms']:.3f}ms "
+                f"p95={result['p95_ms']:.3f}ms "
+                f"mean={result['mean_ms']:.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+
+from helper.bench import bench_pool, measure
+from shared.db import get_async_pool
+from shared.colors import normalize_color
+from shared.matches import get_match_details
+
+
+# Verbatim copy of get_match_details, get_team_details and list_team_players as of the baseline
+# (commit 04f9ed5), so "legacy" measures the code the single query replaced: five round trips,
+# and the team lookups acquire further pooled connections while the match connection is held.
+async def _legacy_team_players(team_id: int):
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT p.id, p.first_name, p.last_name, pt.shirt_number
+            FROM player_team pt
+            JOIN persons p ON p.id = pt.player_id
+            WHERE pt.team_id = %s
+            ORDER BY p.last_name, p.first_name
+            """,
+            (team_id,),
+        )
+        rows = await cur.fetchall()
+        return [
+            {
+                "id": row[0],
+                "first_name": row[1],
+                "last_name": row[2],
+                "number": row[3],
+            }
+            for row in rows
+        ]
+
+
+async def _legacy_team_details(team_id: int):
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT id, division, name, manager_id, short_name, color_primary, color_secondary
+            FROM teams
+            WHERE id = %s
+            """,
+            (team_id,),
+        )
+        row = await cur.fetchone()
+        if not row:
+            return {}
+        players = await _legacy_team_players(team_id)
+        return {
+            "id": row[0],
+            "division": row[1],
+            "name": row[2],
+            "manager_id": row[3],
+            "short_name": row[4],
+            "color_primary": normalize_color(row[5]),
+            "color_secondary": normalize_color(row[6]),
+            "players": players,
+        }
+
+
+async def _legacy_match_details(match_id: int):
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT m.id,
+                   m.division,
+                   m.status,
+                   m.home_team_id,
+                   m.away_team_id,
+                   COALESCE(m.home_score, 0) AS home_score,
+                   COALESCE(m.away_score, 0) AS away_score,
+                   COALESCE(MIN(s.start_time), m.scheduled_start_time) AS start_time,
+                   NOW() AS current_time,
+                   COALESCE(p.first_name || ' ' || p.last_name, '') AS main_referee,
+                   COALESCE(m.notes, '') AS notes,
+                   v.name AS venue
+            FROM matches m
+            JOIN teams ht ON ht.id = m.home_team_id
+            JOIN teams at ON at.id = m.away_team_id
+            LEFT JOIN match_slot ms ON ms.match_id = m.id
+            LEFT JOIN slots s ON s.id = ms.slot_id
+            LEFT JOIN courts c ON c.id = s.court_id
+            LEFT JOIN venues v ON v.id = c.venue_id
+            LEFT JOIN match_referees mr ON mr.match_id = m.id
+            LEFT JOIN persons p ON p.id = mr.referee_id
+            WHERE m.id = %s
+            GROUP BY m.id, m.division, m.status, m.home_team_id, m.away_team_id,
+                     m.home_score, m.away_score, m.notes, p.first_name, p.last_name, v.name,
+                     m.scheduled_start_time
+            """,
+            (match_id,),
+        )
+        row = await cur.fetchone()
+        if not row:
+            return {}
+
+        ht_details = await _legacy_team_details(row[3])
+        at_details = await _legacy_team_details(row[4])
+        return {
+            "id": row[0],
+            "division": row[1],
+            "status": row[2],
+            "home_team": ht_details,
+            "away_team": at_details,
+            "home_score": row[5],
+            "away_score": row[6],
+            "start_time": row[7],
+            "current_time": row[8],
+            "main_referee": row[9],
+            "venue": row[11],
+            "notes": row[10],
+        }
+
+
+async def _pick_match_ids(count: int):
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT id
+            FROM matches
+            ORDER BY id
+            LIMIT %s
+            """,
+            (count,),
+        )
+        rows = await cur.fetchall()
+        return [row[0] for row in rows]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare get_match_details with its baseline version (commit 04f9ed5).")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--matches", type=int, default=50, help="Number of distinct matches to cycle through.")
+    args = parser.parse_args()
+
+    async with bench_pool():
+        match_ids = await _pick_match_ids(args.matches)
+        if not match_ids:
+            print("No matches in the database")
+            return
+        for name, fetch in (("legacy", _legacy_match_details), ("single_query", get_match_details)):
+            result = await measure(fetch, [(match_id,) for match_id in match_ids], args.requests, args.concurrency)
+            print(
+                f"{name:>12}: p50={result['p50_ms']:.2f}ms "
+                f"p95={result['p95_ms']:.2f}ms "
+                f"throughput={result['throughput_rps']:.1f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from worker.tasks.referee_flow import solve_referee_assignment
+
+
+def _build_instance(matches: int, referees: int, candidates: int, seed: int):
+    # Eight start times a day, about forty matches a day, half of them already refereed.
+    rng = random.Random(seed)
+    first = datetime(2026, 1, 5, 9, 0)
+    days = max(1, matches // 40)
+    start_times = [first + timedelta(days=day, hours=hour) for day in range(days) for hour in range(8)]
+    match_rows = []
+    availability = {}
+    for match_id in range(matches):
+        current_referee = rng.randrange(referees) if rng.random() < 0.5 else None
+        match_rows.append((match_id, match_id, rng.choice(start_times), current_referee))
+        availability[match_id] = rng.sample(range(referees), min(candidates, referees))
+    base_load = {referee_id: rng.randrange(5) for referee_id in range(referees) if rng.random() < 0.3}
+    return match_rows, availability, base_load
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the referee assignment solver on a synthetic season.")
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--referees", type=int, default=300)
+    parser.add_argument("--candidates", type=int, default=30, help="Available referees per slot.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    match_rows, availability, base_load = _build_instance(args.matches, args.referees, args.candidates, args.seed)
+    start = time.perf_counter()
+    chosen = solve_referee_assignment(match_rows, availability, base_load)
+    elapsed = time.perf_counter() - start
+    print(f"assigned {len(chosen)}/{len(match_rows)} matches in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+
+from shared.db import get_async_pool, open_async_pool, close_async_pool
+from shared.rankings import update_rankings_for_division
+
+
+async def _get_divisions():
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT DISTINCT division
+            FROM teams
+            ORDER BY division
+            """
+        )
+        rows = await cur.fetchall()
+        return [row[0] for row in rows]
+
+
+async def rebuild_rankings(division: int | None = None):
+    divisions = [division] if division is not None else await _get_divisions()
+    rebuilt = {}
+    for current in divisions:
+        rebuilt[current] = await update_rankings_for_division(current)
+    return rebuilt
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Rebuild the ranking table from finished matches.")
+    parser.add_argument("--division", type=int, default=None, help="Only rebuild this division.")
+    args = parser.parse_args()
+
+    await open_async_pool()
+    try:
+        rebuilt = await rebuild_rankings(args.division)
+        for division, count in rebuilt.items():
+            print(f"Division {division}: {count} teams rebuilt")
+    finally:
+        await close_async_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,14 @@
-
 import os
-from fastapi import APIRouter, HTTPException, status
-from redis import Redis
+from functools import lru_cache
+
+from redis import ConnectionPool, Redis
+from redis.asyncio import Redis as AsyncRedis
 from rq import Queue
-from rq.job import Job
+
+# One connection pool per process for each client flavour: RQ queue operations use the sync
+# client, cache/version counters/pub-sub use the asyncio one. Both are created on first use
+# and closed by close_redis_clients() (FastAPI lifespan).
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
 
 
 def _get_redis_url() -> str:
@@ -13,8 +18,41 @@ def _get_redis_url() -> str:
     return url
 
 
+@lru_cache()
+def get_sync_redis() -> Redis:
+    pool = ConnectionPool.from_url(_get_redis_url(), max_connections=REDIS_MAX_CONNECTIONS)
+    return Redis(connection_pool=pool)
+
+
+@lru_cache()
+def get_async_redis() -> AsyncRedis | None:
+    """Shared asyncio client, or None when REDIS_URL is not configured."""
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    return AsyncRedis.from_url(url, max_connections=REDIS_MAX_CONNECTIONS)
+
+
+@lru_cache()
 def _get_queue() -> Queue:
-    return Queue("scheduler", connection=Redis.from_url(_get_redis_url()))
+    return Queue("scheduler", connection=get_sync_redis())
+
+
+async def close_async_redis() -> None:
+    """Close the asyncio client; it is bound to the event loop that first used it."""
+    if get_async_redis.cache_info().currsize:
+        client = get_async_redis()
+        if client is not None:
+            await client.aclose()
+        get_async_redis.cache_clear()
+
+
+async def close_redis_clients() -> None:
+    await close_async_redis()
+    if get_sync_redis.cache_info().currsize:
+        get_sync_redis().connection_pool.disconnect()
+        get_sync_redis.cache_clear()
+        _get_queue.cache_clear()
 
 
 SCHEDULER_JOB_ID = "scheduler-singleton"
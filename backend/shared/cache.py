@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from helper.redis import get_async_redis
+from shared.db import after_commit
+
+logger = logging.getLogger(__name__)
+
+# Entries are kept in-process for a few seconds and in Redis (shared by every worker) for longer.
+# Invalidation clears Redis and the local copy; other processes catch up within LOCAL_CACHE_TTL_SECONDS.
+LOCAL_CACHE_TTL_SECONDS = float(os.getenv("LOCAL_CACHE_TTL_SECONDS", "5"))
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024"))
+CACHE_KEY_PREFIX = "cache:"
+
+
+class TTLCache:
+    """Small in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+
+_local_cache = TTLCache(LOCAL_CACHE_MAX_ENTRIES, LOCAL_CACHE_TTL_SECONDS)
+
+
+def get_redis():
+    return get_async_redis()
+
+
+async def cache_get(key: str):
+    value = _local_cache.get(key)
+    if value is not None:
+        return value
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        raw = await redis.get(CACHE_KEY_PREFIX + key)
+    except Exception:
+        logger.exception("Redis cache read failed for %s", key)
+        return None
+    if raw is None:
+        return None
+    value = json.loads(raw)
+    _local_cache.set(key, value)
+    return value
+
+
+async def cache_set(key: str, value, ttl: int):
+    _local_cache.set(key, value, min(ttl, LOCAL_CACHE_TTL_SECONDS))
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(CACHE_KEY_PREFIX + key, json.dumps(value, default=str), ex=ttl)
+    except Exception:
+        logger.exception("Redis cache write failed for %s", key)
+
+
+async def cache_delete(key: str):
+    # Deferred inside a unit of work so readers cannot re-cache the uncommitted state.
+    await after_commit(_cache_delete, key)
+
+
+async def _cache_delete(key: str):
+    _local_cache.delete(key)
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(CACHE_KEY_PREFIX + key)
+    except Exception:
+        logger.exception("Redis cache delete failed for %s", key)
+
+
+# Version counters: one integer per resource scope ("previews", "match:<id>", "division:<n>", "teams"),
+# bumped by writers and read by the API to build ETags. Without Redis the counters live in this process
+# only, so tags also carry a per-process token to never match a tag handed out before a restart.
+VERSION_KEY_PREFIX = "version:"
+VERSION_CHANGED_KEY_PREFIX = "version-changed-at:"
+VERSION_CHANGED_TTL_SECONDS = 3600
+_local_versions: dict[str, int] = {}
+_local_changed_at: dict[str, float] = {}
+_local_version_token = uuid.uuid4().hex[:8]
+PREVIEWS_SCOPE = "previews"
+TEAMS_SCOPE = "teams"
+
+
+def match_scope(match_id: int) -> str:
+    return f"match:{match_id}"
+
+
+def division_scope(division: int) -> str:
+    return f"division:{division}"
+
+
+async def get_version_info(*scopes: str) -> tuple[str | None, float]:
+    """Combined version of the given scopes (None when it cannot be determined) and the epoch
+    time of their most recent change (0 when unknown)."""
+    redis = get_redis()
+    if redis is None:
+        versions = [_local_versions.get(scope, 0) for scope in scopes]
+        changed_at = max((_local_changed_at.get(scope, 0.0) for scope in scopes), default=0.0)
+        return f"{_local_version_token}-" + "-".join(str(v) for v in versions), changed_at
+    keys = [VERSION_KEY_PREFIX + scope for scope in scopes]
+    keys += [VERSION_CHANGED_KEY_PREFIX + scope for scope in scopes]
+    try:
+        values = await redis.mget(keys)
+    except Exception:
+        logger.exception("Redis version read failed for %s", scopes)
+        return None, 0.0
+    versions = values[: len(scopes)]
+    changed_at = max((float(value) for value in values[len(scopes):] if value is not None), default=0.0)
+    return "r-" + "-".join(value.decode() if value is not None else "0" for value in versions), changed_at
+
+
+async def bump_versions(*scopes: str):
+    if not scopes:
+        return
+    await after_commit(_bump_versions, *scopes)
+
+
+async def _bump_versions(*scopes: str):
+    now = time.time()
+    for scope in scopes:
+        _local_versions[scope] = _local_versions.get(scope, 0) + 1
+        _local_changed_at[scope] = now
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(VERSION_KEY_PREFIX + scope)
+                pipe.set(VERSION_CHANGED_KEY_PREFIX + scope, now, ex=VERSION_CHANGED_TTL_SECONDS)
+            await pipe.execute()
+    except Exception:
+        logger.exception("Redis version bump failed for %s", scopes)
@@ -38,7 +38,7 @@ async def get_all_courts():
         } for row in row
         ]
 
-async def generate_slots(court_id, start_date, end_date, slots_per_day=6, slots_length=2):
+def _build_slot_grid(court_ids, start_date, end_date, slots_per_day=6, slots_length=2):
     if slots_per_day <= 0:
         raise ValueError("slots_per_day must be positive")
     if slots_length <= 0:
@@ -50,37 +50,59 @@ async def generate_slots(court_id, start_date, end_date, slots_per_day=6, slots_
         raise ValueError("end_date must be on or after start_date")
 
     slot_delta = timedelta(hours=slots_length)
-
-    pool = get_async_pool()
-    created = []
-    async with pool.connection() as conn, conn.cursor() as cur:
-        current_day = start_date
-        while current_day <= end_date:
-            current_start = datetime.combine(
-                current_day, datetime.min.time(), tzinfo=timezone.utc
-            ).replace(hour=8)
+    court_column, start_column, end_column = [], [], []
+    current_day = start_date
+    while current_day <= end_date:
+        day_start = datetime.combine(
+            current_day, datetime.min.time(), tzinfo=timezone.utc
+        ).replace(hour=8)
+        for court_id in court_ids:
+            current_start = day_start
             for _ in range(slots_per_day):
                 current_end = current_start + slot_delta
-                await cur.execute(
-                    """
-                    INSERT INTO slots (court_id, start_time, end_time)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (court_id, start_time) DO NOTHING
-                    RETURNING id, court_id, start_time, end_time
-                    """,
-                    (court_id, current_start, current_end),
-                )
-                row = await cur.fetchone()
-                if row:
-                    created.append(
-                        {
-                            "id": row[0],
-                            "court_id": row[1],
-                            "start_time": row[2],
-                            "end_time": row[3],
-                        }
-                    )
+                court_column.append(court_id)
+                start_column.append(current_start)
+                end_column.append(current_end)
                 current_start = current_end
-            current_day += timedelta(days=1)
+        current_day += timedelta(days=1)
+    return court_column, start_column, end_column
+
+
+async def generate_slots_bulk(court_ids, start_date, end_date, slots_per_day=6, slots_length=2):
+    """Insert the whole slot grid with one set-based statement; court_ids=None means every court."""
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        if court_ids is None:
+            await cur.execute("SELECT id FROM courts ORDER BY id")
+            court_ids = [row[0] for row in await cur.fetchall()]
+        court_column, start_column, end_column = _build_slot_grid(
+            court_ids, start_date, end_date, slots_per_day, slots_length
+        )
+        if not court_column:
+            return []
+        await cur.execute(
+            """
+            INSERT INTO slots (court_id, start_time, end_time)
+            SELECT court_id, start_time, end_time
+            FROM unnest(%s::int[], %s::timestamptz[], %s::timestamptz[])
+                 AS grid(court_id, start_time, end_time)
+            ON CONFLICT (court_id, start_time) DO NOTHING
+            RETURNING id, court_id, start_time, end_time
+            """,
+            (court_column, start_column, end_column),
+        )
+        rows = await cur.fetchall()
         await conn.commit()
-    return created
+        return [
+            {
+                "id": row[0],
+                "court_id": row[1],
+                "start_time": row[2],
+                "end_time": row[3],
+            }
+            for row in rows
+        ]
+
+
+async def generate_slots(court_id, start_date, end_date, slots_per_day=6, slots_length=2):
+    return await generate_slots_bulk([court_id], start_date, end_date, slots_per_day, slots_length)
@@ -1,9 +1,49 @@
+import asyncio
+import logging
 import os
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
 
+from psycopg import AsyncCursor, Pipeline, pq
 from psycopg_pool import AsyncConnectionPool
 
+from shared.metrics import gauge, record_pool_wait, record_query
+
+logger = logging.getLogger(__name__)
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+# Pool sizing. Every API and worker process owns one pool, so the total number of server
+# connections is processes * DB_POOL_MAX_SIZE; keep it under Postgres' max_connections.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+DB_POOL_MAX_WAITING = int(os.getenv("DB_POOL_MAX_WAITING", "0"))
+DB_POOL_MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+DB_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Server-side prepared statements: a query is prepared after DB_PREPARE_THRESHOLD executions on a
+# connection, hot lookups ask for it on first use (execute(..., prepare=True)). Set it to "off"
+# behind PgBouncer in transaction mode (before 1.21), where a statement prepared on one server
+# connection is unknown on the next. DB_PIPELINE=0 sends pipelined batches one query at a time.
+_prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower()
+DB_PREPARE_THRESHOLD = None if _prepare_threshold in ("", "off", "none") else int(_prepare_threshold)
+DB_PIPELINE = os.getenv("DB_PIPELINE", "1") == "1"
+
+# Optional read replica. Functions that only read and tolerate slightly stale data ask for
+# get_async_pool(readonly=True); they fall back to the primary when no replica is configured,
+# when the replica lags more than DB_REPLICA_MAX_LAG_SECONDS, or when primary reads are forced.
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+
+_force_primary: ContextVar[bool] = ContextVar("force_primary", default=False)
+_unit_of_work: ContextVar["_UnitOfWork | None"] = ContextVar("unit_of_work", default=None)
+_replica_state = {"lag_seconds": None, "healthy": False}
+_replica_monitor: asyncio.Task | None = None
+
 
 def _get_database_url() -> str:
     url = os.getenv("DATABASE_URL")
@@ -12,26 +52,334 @@ def _get_database_url() -> str:
     return url
 
 
+def _sql_operation(query) -> str:
+    if isinstance(query, bytes):
+        query = query.decode(errors="ignore")
+    if not isinstance(query, str):
+        return "other"
+    words = query.split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation.lower() if operation in _SQL_OPERATIONS else "other"
+
+
+class InstrumentedAsyncCursor(AsyncCursor):
+    """Cursor recording the duration of every statement in shared.metrics."""
+
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            record_query(_sql_operation(query), time.perf_counter() - start)
+
+    async def executemany(self, query, params_seq, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().executemany(query, params_seq, **kwargs)
+        finally:
+            record_query(_sql_operation(query), time.perf_counter() - start)
+
+
+class _UnitOfWork:
+    def __init__(self, pool: AsyncConnectionPool, conn):
+        self.pool = pool
+        self.conn = conn
+        self.aborted = False
+        self.callbacks = []
+
+
+class _UnitOfWorkConnection:
+    """Connection handed to shared functions inside a unit of work.
+
+    commit() is deferred to the end of the unit of work; rollback() rolls the whole unit back.
+    """
+
+    def __init__(self, uow: _UnitOfWork):
+        self._uow = uow
+
+    def __getattr__(self, name):
+        return getattr(self._uow.conn, name)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        self._uow.aborted = True
+        await self._uow.conn.rollback()
+
+
+class InstrumentedAsyncConnectionPool(AsyncConnectionPool):
+    """Pool recording how long callers wait to get a connection.
+
+    Inside unit_of_work() the connection bound to the current context is reused instead.
+    """
+
+    @asynccontextmanager
+    async def connection(self, timeout: float | None = None):
+        uow = _unit_of_work.get()
+        if uow is not None and uow.pool is self:
+            if uow.aborted:
+                raise RuntimeError("Unit of work was rolled back")
+            try:
+                yield _UnitOfWorkConnection(uow)
+            except BaseException:
+                # A failed statement poisons the transaction: nothing else may run in it.
+                if uow.conn.info.transaction_status == pq.TransactionStatus.INERROR:
+                    uow.aborted = True
+                    await uow.conn.rollback()
+                raise
+            return
+        start = time.perf_counter()
+        async with super().connection(timeout=timeout) as conn:
+            record_pool_wait(time.perf_counter() - start)
+            yield conn
+
+
+def _create_pool(url: str, name: str) -> AsyncConnectionPool:
+    return InstrumentedAsyncConnectionPool(
+        url,
+        name=name,
+        open=False,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=max(DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE),
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        max_waiting=DB_POOL_MAX_WAITING,
+        max_idle=DB_POOL_MAX_IDLE_SECONDS,
+        max_lifetime=DB_POOL_MAX_LIFETIME_SECONDS,
+        kwargs=_connection_kwargs(),
+    )
+
+
 @lru_cache()
-def get_async_pool() -> AsyncConnectionPool:
-    """Create (and cache) a single async connection pool."""
-    return AsyncConnectionPool(_get_database_url(), open=False)
+def _get_primary_pool() -> AsyncConnectionPool:
+    return _create_pool(_get_database_url(), "primary")
+
+
+@lru_cache()
+def _get_replica_pool() -> AsyncConnectionPool | None:
+    url = os.getenv("DATABASE_READ_URL")
+    if not url:
+        return None
+    return _create_pool(url, "replica")
+
+
+def get_async_pool(readonly: bool = False) -> AsyncConnectionPool:
+    """Return the primary pool, or the replica pool for readonly callers when it is usable."""
+    if readonly and not _force_primary.get() and _unit_of_work.get() is None and _replica_state["healthy"]:
+        replica = _get_replica_pool()
+        if replica is not None:
+            return replica
+    return _get_primary_pool()
+
+
+def force_primary():
+    """Route readonly queries of the rest of the current task (e.g. one request) to the primary."""
+    _force_primary.set(True)
+
+
+@contextmanager
+def primary_reads():
+    """Route readonly queries inside the block to the primary (read-after-write paths)."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+@asynccontextmanager
+async def unit_of_work():
+    """Run every query of the block on one primary connection and commit once at the end.
+
+    Shared functions called inside the block transparently reuse the connection; their own
+    commits are deferred and work registered with after_commit() runs once the data is visible
+    to other connections. Nested calls join the outer unit of work.
+    """
+    if _unit_of_work.get() is not None:
+        yield
+        return
+    pool = _get_primary_pool()
+    async with pool.connection() as conn:
+        uow = _UnitOfWork(pool, conn)
+        token = _unit_of_work.set(uow)
+        try:
+            yield
+            if not uow.aborted:
+                await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+    if uow.aborted:
+        return
+    for func, args in uow.callbacks:
+        try:
+            await func(*args)
+        except Exception:
+            logger.exception("after_commit callback %s failed", getattr(func, "__name__", func))
+
+
+async def after_commit(func, *args):
+    """Await func(*args) now, or once the current unit of work has committed."""
+    uow = _unit_of_work.get()
+    if uow is None:
+        await func(*args)
+    elif not uow.aborted:
+        uow.callbacks.append((func, args))
+
+
+async def _check_replica_lag(replica: AsyncConnectionPool):
+    async with replica.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT CASE
+                       WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                       ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                   END
+            """
+        )
+        row = await cur.fetchone()
+        return float(row[0] or 0)
+
+
+async def _monitor_replica(replica: AsyncConnectionPool):
+    while True:
+        try:
+            lag = await _check_replica_lag(replica)
+            _replica_state["lag_seconds"] = lag
+            _replica_state["healthy"] = lag <= DB_REPLICA_MAX_LAG_SECONDS
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Replica lag check failed, reading from the primary")
+            _replica_state["lag_seconds"] = None
+            _replica_state["healthy"] = False
+        await asyncio.sleep(DB_REPLICA_LAG_CHECK_SECONDS)
+
+
+def get_replica_state() -> dict:
+    return {"configured": _get_replica_pool() is not None, **_replica_state}
+
+
+def _connection_kwargs() -> dict:
+    kwargs = {"cursor_factory": InstrumentedAsyncCursor, "prepare_threshold": DB_PREPARE_THRESHOLD}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        kwargs["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    return kwargs
+
+
+def get_pool_stats(readonly: bool = False) -> dict:
+    """Current pool counters (psycopg_pool get_stats) plus the number of connections in use."""
+    pool = _get_replica_pool() if readonly else _get_primary_pool()
+    if pool is None:
+        return {}
+    stats = pool.get_stats()
+    stats["in_use"] = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    return stats
+
+
+def _pool_stats_by_name() -> dict[str, dict]:
+    stats = {"primary": get_pool_stats()}
+    if _get_replica_pool() is not None:
+        stats["replica"] = get_pool_stats(readonly=True)
+    return stats
+
+
+_POOL_CONNECTION_STATS = {"size": "pool_size", "available": "pool_available", "in_use": "in_use", "max": "pool_max"}
+_POOL_EVENT_STATS = (
+    "requests_num",
+    "requests_queued",
+    "requests_errors",
+    "requests_timeouts",
+    "connections_num",
+    "connections_errors",
+    "connections_lost",
+)
+
+gauge(
+    "db_pool_connections",
+    "Connections of the async pools by state.",
+    ("pool", "state"),
+    lambda: {
+        (name, state): stats.get(key, 0)
+        for name, stats in _pool_stats_by_name().items()
+        for state, key in _POOL_CONNECTION_STATS.items()
+    },
+)
+gauge(
+    "db_pool_requests_waiting",
+    "Clients currently waiting for a pooled connection.",
+    ("pool",),
+    lambda: {(name,): stats.get("requests_waiting", 0) for name, stats in _pool_stats_by_name().items()},
+)
+gauge(
+    "db_pool_events",
+    "Cumulative pool events since the pool was opened (psycopg_pool get_stats).",
+    ("pool", "event"),
+    lambda: {
+        (name, event): stats.get(event, 0)
+        for name, stats in _pool_stats_by_name().items()
+        for event in _POOL_EVENT_STATS
+    },
+)
+gauge(
+    "db_replica_lag_seconds",
+    "Replication lag measured on the read replica (absent when unknown).",
+    (),
+    lambda: {(): _replica_state["lag_seconds"]} if _replica_state["lag_seconds"] is not None else {},
+)
 
 
 async def open_async_pool() -> None:
-    """Open the async pool at application startup."""
-    pool = get_async_pool()
+    """Open the async pools at application startup."""
+    global _replica_monitor
+    pool = _get_primary_pool()
     if pool.closed:
         await pool.open()
+    replica = _get_replica_pool()
+    if replica is not None and replica.closed:
+        await replica.open()
+        _replica_monitor = asyncio.create_task(_monitor_replica(replica))
 
 
 async def close_async_pool() -> None:
-    """Close the async pool at application shutdown."""
-    pool = get_async_pool()
+    """Close the async pools at application shutdown."""
+    global _replica_monitor
+    if _replica_monitor is not None:
+        _replica_monitor.cancel()
+        try:
+            await _replica_monitor
+        except asyncio.CancelledError:
+            pass
+        _replica_monitor = None
+        _replica_state["healthy"] = False
+    replica = _get_replica_pool()
+    if replica is not None and not replica.closed:
+        await replica.close()
+    pool = _get_primary_pool()
     if not pool.closed:
         await pool.close()
 
 
+async def fetch_pipelined(conn, queries: list[tuple[str, tuple]]) -> list[list[tuple]]:
+    """Run independent (query, params) pairs in one pipeline (a single round trip) and return
+    the rows of each query, in order."""
+    cursors = [conn.cursor() for _ in queries]
+    try:
+        if DB_PIPELINE and Pipeline.is_supported():
+            async with conn.pipeline():
+                for cur, (query, params) in zip(cursors, queries):
+                    await cur.execute(query, params, prepare=True)
+        else:
+            for cur, (query, params) in zip(cursors, queries):
+                await cur.execute(query, params, prepare=True)
+        return [await cur.fetchall() for cur in cursors]
+    finally:
+        for cur in cursors:
+            await cur.close()
+
+
 @asynccontextmanager
 async def get_async_connection():
     """Yield a pooled async psycopg connection."""
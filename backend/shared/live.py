@@ -0,0 +1,56 @@
+import json
+import logging
+
+from shared.cache import get_redis
+from shared.db import after_commit
+
+logger = logging.getLogger(__name__)
+
+# Score changes and match events are published once per write on two channels (match and division).
+# API processes hold a single pattern subscription and fan the messages out to their SSE clients.
+LIVE_CHANNEL_PREFIX = "live:"
+_local_handlers = []
+
+
+def match_channel(match_id: int) -> str:
+    return f"{LIVE_CHANNEL_PREFIX}match:{match_id}"
+
+
+def division_channel(division: int) -> str:
+    return f"{LIVE_CHANNEL_PREFIX}division:{division}"
+
+
+def add_local_handler(handler):
+    """Receive events in-process when Redis is not configured (handler(channel, data))."""
+    _local_handlers.append(handler)
+
+
+def remove_local_handler(handler):
+    if handler in _local_handlers:
+        _local_handlers.remove(handler)
+
+
+async def publish_match_event(event_type: str, match_id: int, division: int | None, payload: dict):
+    await after_commit(_publish_match_event, event_type, match_id, division, payload)
+
+
+async def _publish_match_event(event_type: str, match_id: int, division: int | None, payload: dict):
+    event = {"type": event_type, "match_id": match_id, "division": division, **payload}
+    data = json.dumps(event, default=str)
+    channels = [match_channel(match_id)]
+    if division is not None:
+        channels.append(division_channel(division))
+
+    redis = get_redis()
+    if redis is None:
+        for channel in channels:
+            for handler in list(_local_handlers):
+                handler(channel, data)
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for channel in channels:
+                pipe.publish(channel, data)
+            await pipe.execute()
+    except Exception:
+        logger.exception("Live event publish failed for match %s", match_id)
@@ -2,9 +2,12 @@ from enum import Enum
 from datetime import datetime
 
 from shared.db import get_async_pool
+from shared.cache import PREVIEWS_SCOPE, bump_versions, match_scope
 from shared.colors import DEFAULT_COLOR, normalize_color
-from shared.teams import get_all_teams_id, get_team_ID_by_name, get_team_details
-from shared.rankings import update_rankings_for_division
+from shared.live import publish_match_event
+from shared.pagination import decode_preview_cursor, encode_preview_cursor
+from shared.teams import get_all_teams_id, get_team_ID_by_name
+from shared.rankings import apply_match_result, invalidate_rankings_cache
 
 import random
 
@@ -181,6 +184,7 @@ async def add_match(
         await conn.commit()
         if not match_row:
             return {}
+        await bump_versions(PREVIEWS_SCOPE)
         return {
             "id": match_row[0],
             "division": match_row[1],
@@ -194,6 +198,97 @@ async def add_match(
         }
 
 
+async def add_matches_bulk(
+    division,
+    pairs: list[tuple[int, int]],
+    status,
+    round_numbers: list[int | None] | None = None,
+):
+    """Insert every (home_team_id, away_team_id) pair of a division in one multi-row insert."""
+    if not pairs:
+        return []
+    if round_numbers is None:
+        round_numbers = [None] * len(pairs)
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO matches (
+                division, home_team_id, away_team_id,
+                status, home_score, away_score, notes, round_number
+            )
+            SELECT %s, p.home_team_id, p.away_team_id, %s, 0, 0, '', p.round_number
+            FROM unnest(%s::int[], %s::int[], %s::int[]) AS p(home_team_id, away_team_id, round_number)
+            RETURNING id
+            """,
+            (
+                division,
+                status,
+                [home_id for home_id, _ in pairs],
+                [away_id for _, away_id in pairs],
+                round_numbers,
+            ),
+        )
+        rows = await cur.fetchall()
+        await conn.commit()
+        await bump_versions(PREVIEWS_SCOPE)
+        return [row[0] for row in rows]
+
+
+async def get_match_pairs():
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT division, home_team_id, away_team_id, status, round_number
+            FROM matches
+            """
+        )
+        rows = await cur.fetchall()
+        return [
+            {
+                "division": row[0],
+                "home_team_id": row[1],
+                "away_team_id": row[2],
+                "status": row[3],
+                "round_number": row[4],
+            }
+            for row in rows
+        ]
+
+
+async def _lock_match_result(cur, match_id: int):
+    """Lock the match row and return (home_team_id, away_team_id, home_score, away_score, status, division)."""
+    await cur.execute(
+        """
+        SELECT home_team_id, away_team_id, home_score, away_score, status, division
+        FROM matches
+        WHERE id = %s
+        FOR UPDATE
+        """,
+        (match_id,),
+    )
+    return await cur.fetchone()
+
+
+async def _move_ranking_result(cur, previous, home_score, away_score, status: str) -> bool:
+    """Swap the match's previous ranking contribution for its new one, on the caller's cursor.
+
+    Only finished matches count in the ranking table. Returns True when the standings changed.
+    """
+    was_finished = previous[4] == MatchStatus.FINISHED.value
+    is_finished = status == MatchStatus.FINISHED.value
+    if not was_finished and not is_finished:
+        return False
+    if was_finished and is_finished and (previous[2] or 0, previous[3] or 0) == (home_score or 0, away_score or 0):
+        return False
+    if was_finished:
+        await apply_match_result(cur, previous[0], previous[1], previous[2], previous[3], sign=-1)
+    if is_finished:
+        await apply_match_result(cur, previous[0], previous[1], home_score, away_score)
+    return True
+
+
 async def addScore(
     match_id,
     team_id,
@@ -204,6 +299,7 @@ async def addScore(
 ):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        previous = await _lock_match_result(cur, match_id)
         if homeOrAway == "home":
             await cur.execute(
                 """
@@ -233,7 +329,13 @@ async def addScore(
                 """,
                 (match_id, team_id, scorer_player_id, minute, is_own_goal),
             )
+        standings_changed = bool(previous and scores) and await _move_ranking_result(
+            cur, previous, scores[0], scores[1], previous[4]
+        )
         await conn.commit()
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
+        if standings_changed:
+            await invalidate_rankings_cache(previous[5])
         return {
             "match_id": match_id,
             "team_id": team_id,
@@ -248,15 +350,7 @@ async def addScore(
 async def add_goal_event(match_id: int, team_id: int, player_id: int | None, minute: int | None, is_own_goal: bool):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
-        await cur.execute(
-            """
-            SELECT home_team_id, away_team_id
-            FROM matches
-            WHERE id = %s
-            """,
-            (match_id,),
-        )
-        match_row = await cur.fetchone()
+        match_row = await _lock_match_result(cur, match_id)
         if not match_row:
             return {}
         home_team_id = match_row[0]
@@ -295,8 +389,15 @@ async def add_goal_event(match_id: int, team_id: int, player_id: int | None, min
             """,
             (match_id, team_id, player_id, minute, is_own_goal),
         )
+        # A goal added to a finished match (admin correction) moves the standings too.
+        standings_changed = bool(scores) and await _move_ranking_result(
+            cur, match_row, scores[0], scores[1], match_row[4]
+        )
         await conn.commit()
-        return {
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
+        if standings_changed:
+            await invalidate_rankings_cache(match_row[5])
+        event = {
             "match_id": match_id,
             "team_id": team_id,
             "player_id": player_id,
@@ -305,6 +406,8 @@ async def add_goal_event(match_id: int, team_id: int, player_id: int | None, min
             "home_score": scores[0] if scores else None,
             "away_score": scores[1] if scores else None,
         }
+        await publish_match_event("goal", match_id, match_row[5], event)
+        return event
 
 
 async def add_card_event(match_id: int, team_id: int, player_id: int, minute: int | None, card_type: str, reason: str | None):
@@ -314,14 +417,20 @@ async def add_card_event(match_id: int, team_id: int, player_id: int, minute: in
             """
             INSERT INTO cards(match_id, team_id, player_id, minute, card_type, reason)
             VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id
+            RETURNING id, (SELECT division FROM matches WHERE id = %s)
             """,
-            (match_id, team_id, player_id, minute, card_type, reason),
+            (match_id, team_id, player_id, minute, card_type, reason, match_id),
         )
         row = await cur.fetchone()
         await conn.commit()
         if not row:
             return {}
+        await publish_match_event(
+            "card",
+            match_id,
+            row[1],
+            {"id": row[0], "team_id": team_id, "player_id": player_id, "minute": minute, "card_type": card_type},
+        )
         return {"id": row[0]}
 
 
@@ -338,20 +447,33 @@ async def add_substitution_event(
             """
             INSERT INTO substitutions(match_id, team_id, player_out_id, player_in_id, minute)
             VALUES (%s, %s, %s, %s, %s)
-            RETURNING id
+            RETURNING id, (SELECT division FROM matches WHERE id = %s)
             """,
-            (match_id, team_id, player_out_id, player_in_id, minute),
+            (match_id, team_id, player_out_id, player_in_id, minute, match_id),
         )
         row = await cur.fetchone()
         await conn.commit()
         if not row:
             return {}
+        await publish_match_event(
+            "substitution",
+            match_id,
+            row[1],
+            {
+                "id": row[0],
+                "team_id": team_id,
+                "player_out_id": player_out_id,
+                "player_in_id": player_in_id,
+                "minute": minute,
+            },
+        )
         return {"id": row[0]}
 
 
 async def set_match_score(match_id: int, home_score: int, away_score: int):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        previous = await _lock_match_result(cur, match_id)
         await cur.execute(
             """
             UPDATE matches
@@ -362,31 +484,30 @@ async def set_match_score(match_id: int, home_score: int, away_score: int):
             (home_score, away_score, match_id),
         )
         row = await cur.fetchone()
+        # Correcting a finished match: swap its old result for the new one in the ranking.
+        standings_changed = bool(row and previous) and await _move_ranking_result(
+            cur, previous, home_score, away_score, previous[4]
+        )
         await conn.commit()
         if not row:
             return {}
-        return {"id": row[0], "home_score": row[1], "away_score": row[2]}
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
+    if standings_changed:
+        await invalidate_rankings_cache(previous[5])
+    result = {"id": row[0], "home_score": row[1], "away_score": row[2]}
+    await publish_match_event("score", match_id, previous[5], result)
+    return result
 
 
 async def finalize_match(match_id: int):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
-        await cur.execute(
-            """
-            SELECT division, home_score, away_score
-            FROM matches
-            WHERE id = %s
-            """,
-            (match_id,),
-        )
-        row = await cur.fetchone()
-        if not row:
+        previous = await _lock_match_result(cur, match_id)
+        if not previous:
             return {}
-        division = row[0]
-        current_home = row[1] or 0
-        current_away = row[2] or 0
-        final_home = current_home 
-        final_away = current_away 
+        division = previous[5]
+        final_home = previous[2] or 0
+        final_away = previous[3] or 0
 
         await cur.execute(
             """
@@ -398,12 +519,20 @@ async def finalize_match(match_id: int):
             (final_home, final_away, MatchStatus.FINISHED.value, match_id),
         )
         updated = await cur.fetchone()
+        # Incremental ranking: only this match's delta, committed with the status change.
+        standings_changed = bool(updated) and await _move_ranking_result(
+            cur, previous, final_home, final_away, MatchStatus.FINISHED.value
+        )
         await conn.commit()
         if not updated:
             return {}
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
 
-    await update_rankings_for_division(division)
-    return {"id": updated[0], "status": updated[1], "home_score": updated[2], "away_score": updated[3]}
+    if standings_changed:
+        await invalidate_rankings_cache(division)
+    result = {"id": updated[0], "status": updated[1], "home_score": updated[2], "away_score": updated[3]}
+    await publish_match_event("finalized", match_id, division, result)
+    return result
 
 
 async def list_matches_in_progress():
@@ -454,6 +583,8 @@ async def list_matches_in_progress():
 async def clear_match_schedule():
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute("SELECT id FROM matches")
+        match_ids = [row[0] for row in await cur.fetchall()]
         await cur.execute("DELETE FROM ref_dispos")
         await cur.execute("DELETE FROM match_referees")
         await cur.execute("DELETE FROM match_slot")
@@ -463,6 +594,7 @@ async def clear_match_schedule():
         await cur.execute("DELETE FROM cards")
         await cur.execute("DELETE FROM substitutions")
         await conn.commit()
+        await bump_versions(PREVIEWS_SCOPE, *(match_scope(match_id) for match_id in match_ids))
 
 async def clear_match_slots_for_matches(match_ids: list[int]):
     if not match_ids:
@@ -478,11 +610,13 @@ async def clear_match_slots_for_matches(match_ids: list[int]):
         )
         deleted = cur.rowcount
         await conn.commit()
+        if deleted:
+            await bump_versions(PREVIEWS_SCOPE, *(match_scope(match_id) for match_id in match_ids))
         return deleted
 
 
 async def get_match_previews():
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -529,51 +663,207 @@ async def get_match_previews():
         ]
 
 
+async def _fetch_preview_rows(cur, conditions: list[str], params: list, order_by: str, limit: int):
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    await cur.execute(
+        f"""
+        SELECT m.id,
+               m.division,
+               m.status,
+               ht.name AS home_team,
+               at.name AS away_team,
+               COALESCE(m.home_score, 0) AS home_score,
+               COALESCE(m.away_score, 0) AS away_score,
+               m.scheduled_start_time AS start_time,
+               ht.color_primary AS home_primary_color,
+               ht.color_secondary AS home_secondary_color,
+               at.color_primary AS away_primary_color,
+               at.color_secondary AS away_secondary_color
+        FROM matches m
+        JOIN teams ht ON ht.id = m.home_team_id
+        JOIN teams at ON at.id = m.away_team_id
+        {where}
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        [*params, limit],
+    )
+    return await cur.fetchall()
+
+
+async def get_match_previews_page(
+    limit: int = 20,
+    cursor: str | None = None,
+    division: int | None = None,
+    status: str | None = None,
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+):
+    """Keyset-paginated previews ordered by (scheduled_start_time NULLS LAST, id)."""
+    conditions = []
+    params: list = []
+    if division is not None:
+        conditions.append("m.division = %s")
+        params.append(division)
+    if status is not None:
+        conditions.append("m.status = %s")
+        params.append(status)
+    if team_id is not None:
+        conditions.append("(m.home_team_id = %s OR m.away_team_id = %s)")
+        params.extend([team_id, team_id])
+    if date_from is not None:
+        conditions.append("m.scheduled_start_time >= %s")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("m.scheduled_start_time < %s")
+        params.append(date_to)
+    pool = get_async_pool(readonly=True)
+    async with pool.connection() as conn, conn.cursor() as cur:
+        if not cursor:
+            rows = await _fetch_preview_rows(
+                cur, conditions, params, "m.scheduled_start_time NULLS LAST, m.id", limit + 1
+            )
+        else:
+            # Two seeks instead of one OR (which defeats the (scheduled_start_time, id) index):
+            # the rows after the cursor with a start time, then the unscheduled ones by id.
+            cursor_time, cursor_id = decode_preview_cursor(cursor)
+            rows = []
+            if cursor_time is not None:
+                rows = await _fetch_preview_rows(
+                    cur,
+                    conditions + ["(m.scheduled_start_time, m.id) > (%s, %s)"],
+                    params + [cursor_time, cursor_id],
+                    "m.scheduled_start_time, m.id",
+                    limit + 1,
+                )
+            # Date filters exclude unscheduled matches.
+            if len(rows) <= limit and date_from is None and date_to is None:
+                null_conditions = conditions + ["m.scheduled_start_time IS NULL"]
+                null_params = list(params)
+                if cursor_time is None:
+                    null_conditions.append("m.id > %s")
+                    null_params.append(cursor_id)
+                rows += await _fetch_preview_rows(cur, null_conditions, null_params, "m.id", limit + 1 - len(rows))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_preview_cursor(rows[-1][7], rows[-1][0])
+        items = [
+            {
+                "id": row[0],
+                "division": row[1],
+                "status": row[2],
+                "home_team": row[3],
+                "away_team": row[4],
+                "home_score": row[5],
+                "away_score": row[6],
+                "start_time": row[7],
+                "home_primary_color": normalize_color(row[8]) or DEFAULT_COLOR,
+                "home_secondary_color": normalize_color(row[9]) or DEFAULT_COLOR,
+                "away_primary_color": normalize_color(row[10]) or DEFAULT_COLOR,
+                "away_secondary_color": normalize_color(row[11]) or DEFAULT_COLOR,
+            }
+            for row in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
+
+
+# Team + roster as one JSON object, aggregated server side (used for both sides of a match).
+_TEAM_DETAILS_JSON = """
+    SELECT json_build_object(
+               'id', t.id,
+               'division', t.division,
+               'name', t.name,
+               'manager_id', t.manager_id,
+               'short_name', t.short_name,
+               'color_primary', t.color_primary,
+               'color_secondary', t.color_secondary,
+               'players', COALESCE(
+                   (SELECT json_agg(
+                               json_build_object(
+                                   'id', p.id,
+                                   'first_name', p.first_name,
+                                   'last_name', p.last_name,
+                                   'number', pt.shirt_number
+                               )
+                               ORDER BY p.last_name, p.first_name
+                           )
+                    FROM player_team pt
+                    JOIN persons p ON p.id = pt.player_id
+                    WHERE pt.team_id = t.id),
+                   '[]'::json
+               )
+           )
+    FROM teams t
+    WHERE t.id = {team_column}
+"""
+
+
+def _team_details_from_json(team: dict | None):
+    if not team:
+        return {}
+    team["color_primary"] = normalize_color(team.get("color_primary"))
+    team["color_secondary"] = normalize_color(team.get("color_secondary"))
+    return team
+
+
 async def get_match_details(match_id: int):
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
-            """
-            SELECT m.id,
-                   m.division,
-                   m.status,
-                   m.home_team_id,
-                   m.away_team_id,
-                   COALESCE(m.home_score, 0) AS home_score,
-                   COALESCE(m.away_score, 0) AS away_score,
-                   COALESCE(MIN(s.start_time), m.scheduled_start_time) AS start_time,
-                   NOW() AS current_time,
-                   COALESCE(p.first_name || ' ' || p.last_name, '') AS main_referee,
-                   COALESCE(m.notes, '') AS notes,
-                   v.name AS venue
-            FROM matches m
-            JOIN teams ht ON ht.id = m.home_team_id
-            JOIN teams at ON at.id = m.away_team_id
-            LEFT JOIN match_slot ms ON ms.match_id = m.id
-            LEFT JOIN slots s ON s.id = ms.slot_id
-            LEFT JOIN courts c ON c.id = s.court_id
-            LEFT JOIN venues v ON v.id = c.venue_id
-            LEFT JOIN match_referees mr ON mr.match_id = m.id
-            LEFT JOIN persons p ON p.id = mr.referee_id
-            WHERE m.id = %s
-            GROUP BY m.id, m.division, m.status, m.home_team_id, m.away_team_id,
-                     m.home_score, m.away_score, m.notes, p.first_name, p.last_name, v.name,
-                     m.scheduled_start_time
+            f"""
+            SELECT d.id,
+                   d.division,
+                   d.status,
+                   ({_TEAM_DETAILS_JSON.format(team_column="d.home_team_id")}) AS home_team,
+                   ({_TEAM_DETAILS_JSON.format(team_column="d.away_team_id")}) AS away_team,
+                   d.home_score,
+                   d.away_score,
+                   d.start_time,
+                   d.current_time,
+                   d.main_referee,
+                   d.notes,
+                   d.venue
+            FROM (
+                SELECT m.id,
+                       m.division,
+                       m.status,
+                       m.home_team_id,
+                       m.away_team_id,
+                       COALESCE(m.home_score, 0) AS home_score,
+                       COALESCE(m.away_score, 0) AS away_score,
+                       COALESCE(MIN(s.start_time), m.scheduled_start_time) AS start_time,
+                       NOW() AS current_time,
+                       COALESCE(p.first_name || ' ' || p.last_name, '') AS main_referee,
+                       COALESCE(m.notes, '') AS notes,
+                       v.name AS venue
+                FROM matches m
+                LEFT JOIN match_slot ms ON ms.match_id = m.id
+                LEFT JOIN slots s ON s.id = ms.slot_id
+                LEFT JOIN courts c ON c.id = s.court_id
+                LEFT JOIN venues v ON v.id = c.venue_id
+                LEFT JOIN match_referees mr ON mr.match_id = m.id
+                LEFT JOIN persons p ON p.id = mr.referee_id
+                WHERE m.id = %s
+                GROUP BY m.id, m.division, m.status, m.home_team_id, m.away_team_id,
+                         m.home_score, m.away_score, m.notes, p.first_name, p.last_name, v.name,
+                         m.scheduled_start_time
+                LIMIT 1
+            ) d
             """,
             (match_id,),
         )
         row = await cur.fetchone()
         if not row:
             return {}
-        
-        ht_details = await get_team_details(row[3])
-        at_details = await get_team_details(row[4])
+
         return {
             "id": row[0],
             "division": row[1],
             "status": row[2],
-            "home_team": ht_details,
-            "away_team": at_details,
+            "home_team": _team_details_from_json(row[3]),
+            "away_team": _team_details_from_json(row[4]),
             "home_score": row[5],
             "away_score": row[6],
             "start_time": row[7],
@@ -595,6 +885,7 @@ async def get_home_and_away_teams_from_match_id(match_id):
             WHERE id = %s
             """,
             (match_id,),
+            prepare=True,
         )
         row = await cur.fetchone()
         if not row:
@@ -708,12 +999,51 @@ async def schedule_match(match_id: int, slot_id: int):
         await conn.commit()
         if not row:
             return {"status": "exists", "match_id": match_id, "slot_id": slot_id}
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
         await update_match_status(match_id, MatchStatus.SCHEDULED)
         return {"status": "created", "slot_id": row[0], "match_id": row[1]}
     
+async def schedule_matches_bulk(assignments: list[tuple[int, int]]):
+    """Bind (match_id, slot_id) pairs in a single transaction and mark them scheduled."""
+    if not assignments:
+        return 0
+    match_ids = [match_id for match_id, _ in assignments]
+    slot_ids = [slot_id for _, slot_id in assignments]
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO match_slot (slot_id, match_id)
+            SELECT slot_id, match_id
+            FROM unnest(%s::int[], %s::int[]) AS a(slot_id, match_id)
+            ON CONFLICT DO NOTHING
+            RETURNING match_id
+            """,
+            (slot_ids, match_ids),
+        )
+        created_ids = [row[0] for row in await cur.fetchall()]
+        if created_ids:
+            await cur.execute(
+                """
+                UPDATE matches m
+                SET scheduled_start_time = s.start_time,
+                    status = %s
+                FROM match_slot ms
+                JOIN slots s ON s.id = ms.slot_id
+                WHERE ms.match_id = m.id AND m.id = ANY(%s)
+                """,
+                (MatchStatus.SCHEDULED.value, created_ids),
+            )
+        await conn.commit()
+        if created_ids:
+            await bump_versions(PREVIEWS_SCOPE, *(match_scope(match_id) for match_id in created_ids))
+        return len(created_ids)
+
+
 async def cancel_match(match_id):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        previous = await _lock_match_result(cur, match_id)
         await cur.execute(
             """
             UPDATE matches
@@ -742,14 +1072,21 @@ async def cancel_match(match_id):
             (MatchStatus.CANCELED.value, match_id),
         )
         row = await cur.fetchone()
+        standings_changed = bool(row and previous) and await _move_ranking_result(
+            cur, previous, previous[2], previous[3], MatchStatus.CANCELED.value
+        )
         await conn.commit()
         if not row:
             return {}
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
+        if standings_changed:
+            await invalidate_rankings_cache(previous[5])
         return {"id": row[0], "status": row[1]}
 
 async def mark_match_postponed(match_id: int):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        previous = await _lock_match_result(cur, match_id)
         await cur.execute(
             """
             UPDATE matches
@@ -778,9 +1115,15 @@ async def mark_match_postponed(match_id: int):
             (MatchStatus.POSTPONED.value, match_id),
         )
         row = await cur.fetchone()
+        standings_changed = bool(row and previous) and await _move_ranking_result(
+            cur, previous, previous[2], previous[3], MatchStatus.POSTPONED.value
+        )
         await conn.commit()
         if not row:
             return {}
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
+        if standings_changed:
+            await invalidate_rankings_cache(previous[5])
         return {"id": row[0], "status": row[1]}
 
 async def start_match(match_id):
@@ -798,6 +1141,7 @@ async def postpone_match(match_id, new_slot_id):
 async def update_match_status(match_id: int, status: MatchStatus):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        previous = await _lock_match_result(cur, match_id)
         await cur.execute(
             """
             UPDATE matches
@@ -808,9 +1152,16 @@ async def update_match_status(match_id: int, status: MatchStatus):
             (status.value, match_id),
         )
         row = await cur.fetchone()
+        # Entering or leaving FINISHED adds or removes the match's result from the ranking.
+        standings_changed = bool(row and previous) and await _move_ranking_result(
+            cur, previous, previous[2], previous[3], status.value
+        )
         await conn.commit()
         if not row:
             return {}
+        await bump_versions(match_scope(match_id), PREVIEWS_SCOPE)
+        if standings_changed:
+            await invalidate_rankings_cache(previous[5])
         return {"id": row[0], "status": row[1]}
     
 async def add_match_slot_id(match_id, slot_id):
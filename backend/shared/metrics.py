@@ -0,0 +1,161 @@
+import threading
+from contextvars import ContextVar
+
+# Minimal in-process metrics registry rendered in the Prometheus text format (no client library).
+# Each API/worker process exposes its own values; Prometheus aggregates across processes.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_lock = threading.Lock()
+_metrics: dict[str, "_Metric"] = {}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: dict | None = None) -> str:
+    pairs = list(zip(names, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple, object] = {}
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = list(self._values.items())
+        for label_values, value in items:
+            lines.extend(self._render_value(label_values, value))
+        return lines
+
+    def _render_value(self, label_values: tuple, value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels, label_values)} {value}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with _lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *label_values):
+        with _lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][position] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_value(self, label_values: tuple, value) -> list[str]:
+        bucket_counts, total, count = value
+        lines = []
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            labels = _format_labels(self.labels, label_values, {"le": bound})
+            lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+        labels = _format_labels(self.labels, label_values, {"le": "+Inf"})
+        lines.append(f"{self.name}_bucket{labels} {count}")
+        labels = _format_labels(self.labels, label_values)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge read from a callback at render time; the callback returns {label_values: value}."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), callback=None):
+        super().__init__(name, help_text, labels)
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        if self.callback is not None:
+            values = self.callback()
+            with _lock:
+                self._values = dict(values)
+        return super().render()
+
+
+def _register(metric: _Metric) -> _Metric:
+    with _lock:
+        existing = _metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        _metrics[metric.name] = metric
+        return metric
+
+
+def counter(name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, help_text, labels))
+
+
+def histogram(name: str, help_text: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, labels, buckets))
+
+
+def gauge(name: str, help_text: str, labels: tuple[str, ...] = (), callback=None) -> Gauge:
+    return _register(Gauge(name, help_text, labels, callback))
+
+
+def render_metrics() -> str:
+    with _lock:
+        metrics = list(_metrics.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Database instrumentation (fed by shared/db.py). Per-request totals are accumulated in a
+# context variable opened by the API timing middleware.
+DB_QUERY_SECONDS = histogram("db_query_duration_seconds", "Duration of SQL statements.", ("operation",))
+DB_POOL_WAIT_SECONDS = histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection.")
+
+_request_db_stats: ContextVar[dict | None] = ContextVar("request_db_stats", default=None)
+
+
+def start_request_db_stats() -> tuple[dict, object]:
+    stats = {"queries": 0, "query_seconds": 0.0, "pool_wait_seconds": 0.0}
+    return stats, _request_db_stats.set(stats)
+
+
+def end_request_db_stats(token):
+    _request_db_stats.reset(token)
+
+
+def record_query(operation: str, seconds: float, count: int = 1):
+    DB_QUERY_SECONDS.observe(seconds, operation)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats["queries"] += count
+        stats["query_seconds"] += seconds
+
+
+def record_pool_wait(seconds: float):
+    DB_POOL_WAIT_SECONDS.observe(seconds)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats["pool_wait_seconds"] += seconds
@@ -0,0 +1,18 @@
+import base64
+import json
+from datetime import datetime
+
+
+# Opaque keyset cursor for match previews: the (scheduled_start_time, id) of the last row served.
+def encode_preview_cursor(start_time: datetime | None, match_id: int) -> str:
+    payload = {"t": start_time.isoformat() if start_time else None, "id": match_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_preview_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        start_time = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        return start_time, int(payload["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -1,53 +1,29 @@
-from shared.db import get_async_pool
+import os
+import time
+
+from shared.db import DB_REPLICA_MAX_LAG_SECONDS, get_async_pool, primary_reads
+from shared.cache import bump_versions, cache_get, cache_set, division_scope, get_version_info
 from shared.colors import DEFAULT_COLOR, normalize_color
 
+RANKINGS_CACHE_TTL_SECONDS = int(os.getenv("RANKINGS_CACHE_TTL_SECONDS", "3600"))
 
-async def _get_division_teams(division: int):
-    pool = get_async_pool()
-    async with pool.connection() as conn, conn.cursor() as cur:
-        await cur.execute(
-            """
-            SELECT id, name
-            FROM teams
-            WHERE division = %s
-            """,
-            (division,),
-        )
-        rows = await cur.fetchall()
-        return [{"id": row[0], "name": row[1]} for row in rows]
 
-
-async def _get_division_team_colors(division: int):
-    pool = get_async_pool()
-    async with pool.connection() as conn, conn.cursor() as cur:
-        await cur.execute(
-            """
-            SELECT id, color_primary, color_secondary
-            FROM teams
-            WHERE division = %s
-            """,
-            (division,),
-        )
-        rows = await cur.fetchall()
-        return {
-            row[0]: {
-                "team_primary_color": normalize_color(row[1]) or DEFAULT_COLOR,
-                "team_secondary_color": normalize_color(row[2]) or DEFAULT_COLOR,
-            }
-            for row in rows
-        }
+def _rankings_cache_key(division: int, version: str) -> str:
+    return f"rankings:{division}:{version}"
 
 
-async def _get_finished_matches(division: int):
-    pool = get_async_pool()
+async def _get_head_to_head_matches(division: int, team_ids: list[int]):
+    """Finished matches played between teams of team_ids (only needed to break ties)."""
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
             SELECT home_team_id, away_team_id, home_score, away_score
             FROM matches
             WHERE division = %s AND status = 'finished'
+              AND home_team_id = ANY(%s) AND away_team_id = ANY(%s)
             """,
-            (division,),
+            (division, team_ids, team_ids),
         )
         rows = await cur.fetchall()
         return [
@@ -70,34 +46,151 @@ def _compute_points(home_score: int, away_score: int):
 
 
 async def compute_rankings(division: int):
-    teams = await _get_division_teams(division)
-    matches = await _get_finished_matches(division)
-    stats = {
-        team["id"]: {
-            "team_id": team["id"],
-            "team_name": team["name"],
-            "points": 0,
-            "goal_diff": 0,
-        }
-        for team in teams
-    }
+    """Division standings from the incrementally maintained ranking table, names and colors included."""
+    pool = get_async_pool(readonly=True)
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT t.id,
+                   t.name,
+                   t.color_primary,
+                   t.color_secondary,
+                   COALESCE(r.points, 0),
+                   COALESCE(r.goal_diff, 0),
+                   COALESCE(r.played, 0),
+                   COALESCE(r.wins, 0),
+                   COALESCE(r.draws, 0),
+                   COALESCE(r.losses, 0),
+                   COALESCE(r.goals_for, 0),
+                   COALESCE(r.goals_against, 0)
+            FROM teams t
+            LEFT JOIN ranking r ON r.team_id = t.id
+            WHERE t.division = %s
+            """,
+            (division,),
+            prepare=True,
+        )
+        rows = await cur.fetchall()
+        return [
+            {
+                "team_id": row[0],
+                "team_name": row[1],
+                "team_primary_color": normalize_color(row[2]) or DEFAULT_COLOR,
+                "team_secondary_color": normalize_color(row[3]) or DEFAULT_COLOR,
+                "points": row[4],
+                "goal_diff": row[5],
+                "played": row[6],
+                "wins": row[7],
+                "draws": row[8],
+                "losses": row[9],
+                "goals_for": row[10],
+                "goals_against": row[11],
+            }
+            for row in rows
+        ]
+
+
+async def rebuild_division_ranking(cur, division: int):
+    """Recompute the ranking rows of the division's teams from its finished matches.
+
+    Runs on the caller's cursor (repair path, and teams moving between divisions).
+    """
+    await cur.execute(
+        """
+        DELETE FROM ranking
+        WHERE team_id IN (SELECT id FROM teams WHERE division = %s)
+        """,
+        (division,),
+    )
+    await cur.execute(
+        """
+        INSERT INTO ranking (team_id, goal_diff, points, played, wins, draws, losses, goals_for, goals_against)
+        SELECT t.id,
+               COALESCE(SUM(r.goals_for - r.goals_against), 0),
+               COALESCE(SUM(CASE WHEN r.goals_for > r.goals_against THEN 3
+                                 WHEN r.goals_for = r.goals_against THEN 1
+                                 ELSE 0 END), 0),
+               COUNT(r.team_id),
+               COUNT(r.team_id) FILTER (WHERE r.goals_for > r.goals_against),
+               COUNT(r.team_id) FILTER (WHERE r.goals_for = r.goals_against),
+               COUNT(r.team_id) FILTER (WHERE r.goals_for < r.goals_against),
+               COALESCE(SUM(r.goals_for), 0),
+               COALESCE(SUM(r.goals_against), 0)
+        FROM teams t
+        LEFT JOIN (
+            SELECT home_team_id AS team_id,
+                   COALESCE(home_score, 0) AS goals_for,
+                   COALESCE(away_score, 0) AS goals_against
+            FROM matches
+            WHERE division = %s AND status = 'finished'
+            UNION ALL
+            SELECT away_team_id,
+                   COALESCE(away_score, 0),
+                   COALESCE(home_score, 0)
+            FROM matches
+            WHERE division = %s AND status = 'finished'
+        ) r ON r.team_id = t.id
+        WHERE t.division = %s
+        GROUP BY t.id
+        RETURNING team_id
+        """,
+        (division, division, division),
+    )
+    return len(await cur.fetchall())
+
+
+def _result_rows(home_id: int, away_id: int, home_score: int, away_score: int):
+    """Ranking contribution of one finished match for both teams."""
+    home_pts, away_pts = _compute_points(home_score, away_score)
+    rows = []
+    for team_id, points, goals_for, goals_against in (
+        (home_id, home_pts, home_score, away_score),
+        (away_id, away_pts, away_score, home_score),
+    ):
+        rows.append(
+            {
+                "team_id": team_id,
+                "points": points,
+                "goal_diff": goals_for - goals_against,
+                "played": 1,
+                "wins": 1 if goals_for > goals_against else 0,
+                "draws": 1 if goals_for == goals_against else 0,
+                "losses": 1 if goals_for < goals_against else 0,
+                "goals_for": goals_for,
+                "goals_against": goals_against,
+            }
+        )
+    return rows[0], rows[1]
+
+
+_RANKING_COLUMNS = ("goal_diff", "points", "played", "wins", "draws", "losses", "goals_for", "goals_against")
 
-    for match in matches:
-        home_id = match["home_team_id"]
-        away_id = match["away_team_id"]
-        home_score = match["home_score"]
-        away_score = match["away_score"]
-        if home_id in stats:
-            stats[home_id]["goal_diff"] += home_score - away_score
-        if away_id in stats:
-            stats[away_id]["goal_diff"] += away_score - home_score
-        home_pts, away_pts = _compute_points(home_score, away_score)
-        if home_id in stats:
-            stats[home_id]["points"] += home_pts
-        if away_id in stats:
-            stats[away_id]["points"] += away_pts
 
-    return list(stats.values()), matches
+async def apply_match_result(cur, home_id: int, away_id: int, home_score: int, away_score: int, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) one match result from the ranking table with an UPSERT.
+
+    Runs on the caller's cursor so the delta commits with the match update.
+    """
+    rows = _result_rows(home_id, away_id, home_score or 0, away_score or 0)
+    await cur.executemany(
+        """
+        INSERT INTO ranking (team_id, goal_diff, points, played, wins, draws, losses, goals_for, goals_against)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (team_id) DO UPDATE
+        SET goal_diff = COALESCE(ranking.goal_diff, 0) + EXCLUDED.goal_diff,
+            points = COALESCE(ranking.points, 0) + EXCLUDED.points,
+            played = ranking.played + EXCLUDED.played,
+            wins = ranking.wins + EXCLUDED.wins,
+            draws = ranking.draws + EXCLUDED.draws,
+            losses = ranking.losses + EXCLUDED.losses,
+            goals_for = ranking.goals_for + EXCLUDED.goals_for,
+            goals_against = ranking.goals_against + EXCLUDED.goals_against
+        """,
+        [
+            (row["team_id"], *(sign * row[column] for column in _RANKING_COLUMNS))
+            for row in rows
+        ],
+    )
 
 
 def _compute_head_to_head_points(matches: list[dict], team_ids: list[int]):
@@ -115,7 +208,7 @@ def _compute_head_to_head_points(matches: list[dict], team_ids: list[int]):
 
 
 async def get_rankings_with_tiebreak(division: int):
-    rankings, matches = await compute_rankings(division)
+    rankings = await compute_rankings(division)
     rankings.sort(key=lambda r: (-r["points"], -r["goal_diff"]))
 
     grouped = {}
@@ -123,6 +216,9 @@ async def get_rankings_with_tiebreak(division: int):
         key = (row["points"], row["goal_diff"])
         grouped.setdefault(key, []).append(row)
 
+    tied_team_ids = [row["team_id"] for group in grouped.values() if len(group) > 1 for row in group]
+    matches = await _get_head_to_head_matches(division, tied_team_ids) if tied_team_ids else []
+
     sorted_rankings = []
     for key in sorted(grouped.keys(), key=lambda k: (-k[0], -k[1])):
         group = grouped[key]
@@ -140,13 +236,40 @@ async def get_rankings_with_tiebreak(division: int):
 
 
 async def get_rankings_view(division: int):
+    """Public standings, cached per division version: a result change moves readers to a new key."""
+    scope = division_scope(division)
+    version, changed_at = await get_version_info(scope)
+    if version is None:
+        return await _build_rankings_view(division)
+    key = _rankings_cache_key(division, version)
+    cached = await cache_get(key)
+    if cached is not None:
+        return cached
+    if time.time() - changed_at < DB_REPLICA_MAX_LAG_SECONDS:
+        # Just invalidated: a lagging replica could still return the previous standings.
+        with primary_reads():
+            view = await _build_rankings_view(division)
+    else:
+        view = await _build_rankings_view(division)
+    # The version moved while the view was built: it may predate that write, do not cache it.
+    current, _ = await get_version_info(scope)
+    if current == version:
+        await cache_set(key, view, RANKINGS_CACHE_TTL_SECONDS)
+    return view
+
+
+async def invalidate_rankings_cache(division: int):
+    # Cached views are keyed by the division version; entries of older versions expire unused.
+    await bump_versions(division_scope(division))
+
+
+async def _build_rankings_view(division: int):
     rankings = await get_rankings_with_tiebreak(division)
-    colors = await _get_division_team_colors(division)
     return [
         {
             "team_name": row["team_name"],
-            "team_primary_color": colors.get(row["team_id"], {}).get("team_primary_color"),
-            "team_secondary_color": colors.get(row["team_id"], {}).get("team_secondary_color"),
+            "team_primary_color": row["team_primary_color"],
+            "team_secondary_color": row["team_secondary_color"],
             "points": row["points"],
             "goal_difference": row["goal_diff"],
         }
@@ -155,23 +278,10 @@ async def get_rankings_view(division: int):
 
 
 async def update_rankings_for_division(division: int):
-    rankings, _ = await compute_rankings(division)
+    """Full rebuild of the division's ranking rows (repair path, see helper/rebuild_rankings.py)."""
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
-        await cur.execute(
-            """
-            DELETE FROM ranking
-            WHERE team_id IN (SELECT id FROM teams WHERE division = %s)
-            """,
-            (division,),
-        )
-        if rankings:
-            await cur.executemany(
-                """
-                INSERT INTO ranking (team_id, goal_diff, points)
-                VALUES (%s, %s, %s)
-                """,
-                [(row["team_id"], row["goal_diff"], row["points"]) for row in rankings],
-            )
+        rebuilt = await rebuild_division_ranking(cur, division)
         await conn.commit()
-    return rankings
+    await invalidate_rankings_cache(division)
+    return rebuilt
@@ -3,7 +3,7 @@ from datetime import datetime, timedelta, timezone
 from helper.redis import _get_queue
 from shared.persons import create_person
 from shared.db import get_async_pool
-from worker.tasks.assign_referee import run_assign_referees_for_slots
+from worker.tasks.assign_referee import REFEREE_JOB_TIMEOUT_SECONDS, run_assign_referees_for_slots
 
 
 async def create_referee(person_id):
@@ -25,7 +25,7 @@ async def create_referee(person_id):
 
 
 async def get_referee_availability(referee_id: int):
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -68,7 +68,7 @@ async def add_referee_availability(referee_id: int, slot_id: int):
         if not row:
             return {}
         queue = _get_queue()
-        queue.enqueue(run_assign_referees_for_slots, [slot_id])
+        queue.enqueue(run_assign_referees_for_slots, [slot_id], job_timeout=REFEREE_JOB_TIMEOUT_SECONDS)
         return {"id": row[0], "slot_id": row[1]}
 
 
@@ -103,7 +103,7 @@ async def remove_referee_availability(referee_id: int, slot_id: int):
         if not row:
             return {}
         queue = _get_queue()
-        queue.enqueue(run_assign_referees_for_slots, [slot_id])
+        queue.enqueue(run_assign_referees_for_slots, [slot_id], job_timeout=REFEREE_JOB_TIMEOUT_SECONDS)
         return {"id": row[0], "slot_id": row[1]}
 
 
@@ -118,12 +118,12 @@ async def replace_referee_availability(referee_id: int, slot_ids: list[int]):
             )
         await conn.commit()
         queue = _get_queue()
-        queue.enqueue(run_assign_referees_for_slots, None)
+        queue.enqueue(run_assign_referees_for_slots, None, job_timeout=REFEREE_JOB_TIMEOUT_SECONDS)
         return {"id": referee_id, "count": len(slot_ids)}
 
 
 async def get_referee_matches(referee_id: int):
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -165,7 +165,7 @@ async def get_referee_matches(referee_id: int):
 
 
 async def get_referee_history(referee_id: int):
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -211,7 +211,7 @@ async def get_referee_history(referee_id: int):
         ]
 
 async def get_match_slots_without_referee(referee_id: int):
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -1,6 +1,5 @@
-from shared.db import get_async_pool
+from shared.db import fetch_pipelined, get_async_pool
 from shared.matches import get_home_and_away_teams_from_match_id
-from shared.teams import list_team_players
 
 
 async def add_slot(court_id, start_time, end_time):
@@ -134,7 +133,7 @@ async def get_match_at_slot(slot_id):
             SELECT match_id
             FROM match_slot
             WHERE slot_id = %s
-            """, (slot_id,)
+            """, (slot_id,), prepare=True
         )
         row = await cur.fetchone()
         if not row:
@@ -150,35 +149,92 @@ async def get_matches_sloted_at_same_time(slot_id, start_time, end_time): # gets
             FROM slots s
             JOIN match_slot ms ON ms.slot_id = s.id
             WHERE s.id <> %s and s.start_time = %s and s.end_time = %s
-            """, (slot_id, start_time, end_time)
+            """, (slot_id, start_time, end_time), prepare=True
         )
         rows = await cur.fetchall()
         return [{"match_id": row[0]} for row in rows]
 
+_MATCH_TEAMS_SQL = """
+    SELECT home_team_id, away_team_id
+    FROM matches
+    WHERE id = %s
+"""
+_TEAM_PLAYER_IDS_SQL = """
+    SELECT player_id
+    FROM player_team
+    WHERE team_id = %s
+"""
+
+
 async def are_parallel_matches_possible(slot, h_team_id, a_team_id):
     parallel_matches = await get_matches_sloted_at_same_time(slot["id"], slot["start_time"], slot["end_time"])
     if not parallel_matches:
         return True
-    # See if our team is playing in any of the parallel matches or not.
-    for parallel_match in parallel_matches:
-        parallel_match_team_ids = await get_home_and_away_teams_from_match_id(parallel_match["match_id"])
-        if h_team_id in parallel_match_team_ids or a_team_id in parallel_match_team_ids:
-            return False
+    pool = get_async_pool()
+    async with pool.connection() as conn:
+        # Teams of every parallel match and both rosters are independent lookups: one round trip.
+        results = await fetch_pipelined(
+            conn,
+            [(_MATCH_TEAMS_SQL, (match["match_id"],)) for match in parallel_matches]
+            + [(_TEAM_PLAYER_IDS_SQL, (h_team_id,)), (_TEAM_PLAYER_IDS_SQL, (a_team_id,))],
+        )
+        parallel_teams = [rows[0] for rows in results[:-2] if rows]
+        # See if our team is playing in any of the parallel matches or not.
+        for teams in parallel_teams:
+            if h_team_id in teams or a_team_id in teams:
+                return False
 
-    # See if any players in our team are in the parallel matches or not.
-    all_home_players_in_this_match = await list_team_players(h_team_id)
-    all_away_players_in_this_match = await list_team_players(a_team_id)
-    home_player_ids = {player["id"] for player in all_home_players_in_this_match if "id" in player}
-    away_player_ids = {player["id"] for player in all_away_players_in_this_match if "id" in player}
-    for p_match in parallel_matches:
-        p_teams_ids = await get_home_and_away_teams_from_match_id(p_match["match_id"])
-        all_home_players_in_that_match = await list_team_players(p_teams_ids[0])
-        all_away_players_in_that_match = await list_team_players(p_teams_ids[1])
-        parallel_home_ids = {player["id"] for player in all_home_players_in_that_match if "id" in player}
-        parallel_away_ids = {player["id"] for player in all_away_players_in_that_match if "id" in player}
-        if home_player_ids & (parallel_home_ids | parallel_away_ids):
-            return False
-        if away_player_ids & (parallel_home_ids | parallel_away_ids):
-            return False
-    
-    return True
+        # See if any players in our team are in the parallel matches or not.
+        our_player_ids = {row[0] for rows in results[-2:] for row in rows}
+        parallel_team_ids = sorted({team_id for teams in parallel_teams for team_id in teams if team_id is not None})
+        rosters = await fetch_pipelined(conn, [(_TEAM_PLAYER_IDS_SQL, (team_id,)) for team_id in parallel_team_ids])
+    parallel_player_ids = {row[0] for rows in rosters for row in rows}
+    return not (our_player_ids & parallel_player_ids)
+
+
+async def load_schedule_snapshot():
+    """Load slots, match_slot, matches and player_team in one connection for the in-memory scheduler."""
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT id, court_id, start_time, end_time
+            FROM slots
+            """
+        )
+        slots = [
+            {"id": row[0], "court_id": row[1], "start_time": row[2], "end_time": row[3]}
+            for row in await cur.fetchall()
+        ]
+        await cur.execute(
+            """
+            SELECT match_id, slot_id
+            FROM match_slot
+            """
+        )
+        placements = [(row[0], row[1]) for row in await cur.fetchall()]
+        await cur.execute(
+            """
+            SELECT id, home_team_id, away_team_id, round_number
+            FROM matches
+            """
+        )
+        match_rows = await cur.fetchall()
+        match_teams = {row[0]: (row[1], row[2]) for row in match_rows}
+        match_rounds = {row[0]: row[3] for row in match_rows if row[3] is not None}
+        await cur.execute(
+            """
+            SELECT team_id, player_id
+            FROM player_team
+            """
+        )
+        team_players: dict[int, set[int]] = {}
+        for team_id, player_id in await cur.fetchall():
+            team_players.setdefault(team_id, set()).add(player_id)
+        return {
+            "slots": slots,
+            "placements": placements,
+            "match_teams": match_teams,
+            "match_rounds": match_rounds,
+            "team_players": team_players,
+        }
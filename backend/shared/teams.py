@@ -1,5 +1,7 @@
 from shared.db import get_async_pool
+from shared.cache import PREVIEWS_SCOPE, TEAMS_SCOPE, bump_versions
 from shared.colors import DEFAULT_COLOR, normalize_color
+from shared.rankings import invalidate_rankings_cache, rebuild_division_ranking
 
 async def get_all_teams_id():
     pool = get_async_pool()
@@ -127,6 +129,7 @@ async def create_team(division, name, manager_id, short_name, color_primary, col
         await conn.commit()
         if not team:
             return {}
+        await invalidate_rankings_cache(team[1])
         return {
             "id": team[0],
             "division": team[1],
@@ -143,6 +146,8 @@ async def update_team(team_id, division, name, short_name, color_primary, color_
     color_primary = normalize_color(color_primary) or DEFAULT_COLOR
     color_secondary = normalize_color(color_secondary) or DEFAULT_COLOR
     async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute("SELECT division FROM teams WHERE id = %s FOR UPDATE", (team_id,))
+        previous = await cur.fetchone()
         await cur.execute(
             """
             UPDATE teams
@@ -157,9 +162,16 @@ async def update_team(team_id, division, name, short_name, color_primary, color_
             (division, name, short_name, color_primary, color_secondary, team_id),
         )
         team = await cur.fetchone()
+        if team and previous and previous[0] != team[1]:
+            # Ranking rows only count matches of the team's current division.
+            await rebuild_division_ranking(cur, team[1])
         await conn.commit()
         if not team:
             return {}
+        await bump_versions(TEAMS_SCOPE, PREVIEWS_SCOPE)
+        # Standings show team names and colors: refresh both divisions on a move.
+        for affected_division in {team[1], previous[0]}:
+            await invalidate_rankings_cache(affected_division)
         return {
             "id": team[0],
             "division": team[1],
@@ -187,6 +199,7 @@ async def add_player(player_id, team_id, shirt_number):
         await conn.commit()
         if not player_team:
             return {}
+        await bump_versions(TEAMS_SCOPE)
         return {
             "player_id": player_team[0],
             "team_id": player_team[1],
@@ -209,6 +222,7 @@ async def remove_player_from_team(player_id, team_id):
         await conn.commit()
         if not row:
             return {}
+        await bump_versions(TEAMS_SCOPE)
         return {"player_id": row[0], "team_id": row[1]}
 
 
@@ -224,6 +238,7 @@ async def list_team_players(team_id: int):
             ORDER BY p.last_name, p.first_name
             """,
             (team_id,),
+            prepare=True,
         )
         rows = await cur.fetchall()
         return [
@@ -1,15 +1,27 @@
+import os
 from enum import Enum
 from shared.managers import create_manager
 from shared.referees import create_referee
 from shared.db import get_async_pool
 from shared.persons import create_person
 
+# Authenticated requests read users through a short-lived cache (see api/app/services/auth.py).
+# Nothing changes is_active or roles after signup today, so entries are never invalidated: a user
+# deactivated or given new roles in the database keeps the cached ones for up to this TTL.
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+
 class UserRoles(str, Enum):
     MANAGER = "MANAGER"
     FAN = "FAN"
     REFEREE = "REFEREE"
     ADMIN = "ADMIN"
 
+
+def user_cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
 async def get_user_by_email(email: str):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
@@ -48,6 +60,7 @@ async def get_user_by_id_with_roles(user_id: int):
             GROUP BY u.id, u.email
             """,
             (user_id,),
+            prepare=True,
         )
         row = await cur.fetchone()
         if not row:
@@ -133,3 +146,87 @@ async def create_user(
             "person_id": user[3],
             "roles": [r[1] for r in role_rows],
         }
+
+
+async def create_user_with_role_keys(
+    first_name: str,
+    last_name: str,
+    email: str,
+    password_hash: str,
+    roles: list[str],
+    role_keys: dict[str, str],
+):
+    """Create person, role rows, user and consume the role keys in one transaction.
+
+    role_keys maps each role that requires a key to its token. Keys are consumed with a conditional
+    update, so two concurrent signups can never use the same key; any failure rolls everything back.
+    """
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO persons (first_name, last_name)
+            VALUES (%s, %s)
+            RETURNING id
+            """,
+            (first_name, last_name),
+        )
+        person_id = (await cur.fetchone())[0]
+        await cur.execute(
+            """
+            INSERT INTO users (email, password_hash, person_id)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (email) DO NOTHING
+            RETURNING id, created_at, is_active
+            """,
+            (email, password_hash, person_id),
+        )
+        user = await cur.fetchone()
+        if not user:
+            await conn.rollback()
+            raise ValueError("Email already used")
+
+        if role_keys:
+            await cur.execute(
+                """
+                UPDATE role_invite_keys k
+                SET used_by = %s, used_at = NOW()
+                FROM unnest(%s::text[], %s::text[]) AS r(role_name, token)
+                WHERE k.role_name = r.role_name AND k.token = r.token AND k.used_at IS NULL
+                RETURNING k.role_name
+                """,
+                (user[0], list(role_keys), list(role_keys.values())),
+            )
+            consumed = {row[0] for row in await cur.fetchall()}
+            for role in role_keys:
+                if role not in consumed:
+                    await conn.rollback()
+                    raise ValueError(f"Invalid or used role key for {role}")
+
+        await cur.execute("SELECT id, name FROM roles WHERE name = ANY(%s)", (roles,))
+        role_rows = await cur.fetchall()
+        if not role_rows:
+            await conn.rollback()
+            raise ValueError("No valid roles")
+        role_names = [r[1] for r in role_rows]
+        if UserRoles.MANAGER.value in role_names:
+            await cur.execute("INSERT INTO managers (person_id) VALUES (%s)", (person_id,))
+        if UserRoles.REFEREE.value in role_names:
+            await cur.execute("INSERT INTO referees (person_id) VALUES (%s)", (person_id,))
+        await cur.execute(
+            """
+            INSERT INTO user_roles (user_id, role_id)
+            SELECT %s, unnest(%s::int[])
+            ON CONFLICT DO NOTHING
+            """,
+            (user[0], [r[0] for r in role_rows]),
+        )
+        await conn.commit()
+        return {
+            "id": user[0],
+            "email": email,
+            "is_active": user[2],
+            "created_at": user[1],
+            "person_id": person_id,
+            "roles": role_names,
+        }
@@ -1,5 +1,60 @@
+from shared.cache import PREVIEWS_SCOPE, bump_versions, match_scope
 from shared.db import get_async_pool
-from shared.matches import MatchStatus
+from shared.matches import MatchStatus, _move_ranking_result
+from shared.rankings import invalidate_rankings_cache
+
+
+async def _cancel_matches(cur, match_ids: list[int]) -> set[int]:
+    """Cancel matches losing their slots, on the caller's cursor.
+
+    Finished results are taken out of the ranking table in the same transaction. Returns the
+    divisions whose standings changed.
+    """
+    if not match_ids:
+        return set()
+    await cur.execute(
+        """
+        SELECT id, home_team_id, away_team_id, home_score, away_score, status, division
+        FROM matches
+        WHERE id = ANY(%s)
+        ORDER BY id
+        FOR UPDATE
+        """,
+        (match_ids,),
+    )
+    previous_rows = await cur.fetchall()
+    await cur.execute(
+        """
+        UPDATE matches
+        SET status = %s,
+            scheduled_start_time = COALESCE(
+                matches.scheduled_start_time,
+                ms_start.start_time
+            )
+        FROM (
+            SELECT ms.match_id, MIN(s.start_time) AS start_time
+            FROM match_slot ms
+            JOIN slots s ON s.id = ms.slot_id
+            WHERE ms.match_id = ANY(%s)
+            GROUP BY ms.match_id
+        ) AS ms_start
+        WHERE matches.id = ms_start.match_id
+        """,
+        (MatchStatus.CANCELED.value, match_ids),
+    )
+    await cur.execute(
+        """
+        DELETE FROM match_slot
+        WHERE match_id = ANY(%s)
+        """,
+        (match_ids,),
+    )
+    ranking_divisions = set()
+    for row in previous_rows:
+        previous = row[1:]
+        if await _move_ranking_result(cur, previous, previous[2], previous[3], MatchStatus.CANCELED.value):
+            ranking_divisions.add(previous[5])
+    return ranking_divisions
 
 
 async def add_venue(name, address, courts_count: int):
@@ -36,7 +91,7 @@ async def add_venue(name, address, courts_count: int):
 
 
 async def list_venues():
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -60,6 +115,16 @@ async def list_venues():
 async def update_venue(venue_id: int, name: str, address: str | None, courts_count: int):
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT name
+            FROM venues
+            WHERE id = %s
+            FOR UPDATE
+            """,
+            (venue_id,),
+        )
+        previous = await cur.fetchone()
         await cur.execute(
             """
             UPDATE venues
@@ -75,6 +140,22 @@ async def update_venue(venue_id: int, name: str, address: str | None, courts_cou
             await conn.rollback()
             return {}
 
+        ranking_divisions: set[int] = set()
+        canceled_match_ids: list[int] = []
+        # Match details show the venue name: a rename changes every match played there.
+        renamed_match_ids: list[int] = []
+        if previous[0] != row[1]:
+            await cur.execute(
+                """
+                SELECT DISTINCT ms.match_id
+                FROM match_slot ms
+                JOIN slots s ON s.id = ms.slot_id
+                JOIN courts c ON c.id = s.court_id
+                WHERE c.venue_id = %s
+                """,
+                (venue_id,),
+            )
+            renamed_match_ids = [match_row[0] for match_row in await cur.fetchall()]
         await cur.execute(
             """
             SELECT COUNT(*) FROM courts WHERE venue_id = %s
@@ -115,35 +196,9 @@ async def update_venue(venue_id: int, name: str, address: str | None, courts_cou
                     """,
                     (courts_to_remove,),
                 )
-                match_ids = [row[0] for row in await cur.fetchall()]
+                canceled_match_ids = [row[0] for row in await cur.fetchall()]
 
-                if match_ids:
-                    await cur.execute(
-                        """
-                        UPDATE matches
-                        SET status = %s,
-                            scheduled_start_time = COALESCE(
-                                matches.scheduled_start_time,
-                                ms_start.start_time
-                            )
-                        FROM (
-                            SELECT ms.match_id, MIN(s.start_time) AS start_time
-                            FROM match_slot ms
-                            JOIN slots s ON s.id = ms.slot_id
-                            WHERE ms.match_id = ANY(%s)
-                            GROUP BY ms.match_id
-                        ) AS ms_start
-                        WHERE matches.id = ms_start.match_id
-                        """,
-                        (MatchStatus.CANCELED.value, match_ids),
-                    )
-                    await cur.execute(
-                        """
-                        DELETE FROM match_slot
-                        WHERE match_id = ANY(%s)
-                        """,
-                        (match_ids,),
-                    )
+                ranking_divisions = await _cancel_matches(cur, canceled_match_ids)
 
                 await cur.execute(
                     """
@@ -161,6 +216,14 @@ async def update_venue(venue_id: int, name: str, address: str | None, courts_cou
                 )
 
         await conn.commit()
+        for division in ranking_divisions:
+            await invalidate_rankings_cache(division)
+        touched = set(canceled_match_ids) | set(renamed_match_ids)
+        if touched:
+            scopes = [match_scope(match_id) for match_id in touched]
+            if canceled_match_ids:
+                scopes.append(PREVIEWS_SCOPE)
+            await bump_versions(*scopes)
         return {
             "id": row[0],
             "name": row[1],
@@ -192,33 +255,7 @@ async def delete_venue(venue_id: int):
         affected = await cur.fetchall()
         match_ids = [row[0] for row in affected]
 
-        if match_ids:
-            await cur.execute(
-                """
-                UPDATE matches
-                SET status = %s,
-                    scheduled_start_time = COALESCE(
-                        matches.scheduled_start_time,
-                        ms_start.start_time
-                    )
-                FROM (
-                    SELECT ms.match_id, MIN(s.start_time) AS start_time
-                    FROM match_slot ms
-                    JOIN slots s ON s.id = ms.slot_id
-                    WHERE ms.match_id = ANY(%s)
-                    GROUP BY ms.match_id
-                ) AS ms_start
-                WHERE matches.id = ms_start.match_id
-                """,
-                (MatchStatus.CANCELED.value, match_ids),
-            )
-            await cur.execute(
-                """
-                DELETE FROM match_slot
-                WHERE match_id = ANY(%s)
-                """,
-                (match_ids,),
-            )
+        ranking_divisions = await _cancel_matches(cur, match_ids)
 
         await cur.execute(
             """
@@ -244,6 +281,10 @@ async def delete_venue(venue_id: int):
         )
         row = await cur.fetchone()
         await conn.commit()
+        for division in ranking_divisions:
+            await invalidate_rankings_cache(division)
+        if match_ids:
+            await bump_versions(PREVIEWS_SCOPE, *(match_scope(match_id) for match_id in match_ids))
         if not row:
             return {}
         return {
@@ -261,7 +302,7 @@ async def delete_venue(venue_id: int):
 
 
 async def list_venue_matches(venue_id: int):
-    pool = get_async_pool()
+    pool = get_async_pool(readonly=True)
     async with pool.connection() as conn, conn.cursor() as cur:
         await cur.execute(
             """
@@ -0,0 +1,41 @@
+import base64
+from datetime import datetime, timezone
+
+import pytest
+
+from shared.pagination import decode_preview_cursor, encode_preview_cursor
+
+
+@pytest.mark.parametrize(
+    "start_time",
+    [
+        datetime(2025, 5, 17, 14, 30),
+        datetime(2025, 5, 17, 14, 30, 15, 250000, tzinfo=timezone.utc),
+        None,
+    ],
+)
+def test_cursor_round_trip(start_time):
+    cursor = encode_preview_cursor(start_time, 42)
+    assert decode_preview_cursor(cursor) == (start_time, 42)
+
+
+def test_cursor_keeps_timezone():
+    start_time = datetime(2025, 5, 17, 14, 30, tzinfo=timezone.utc)
+    decoded_time, _ = decode_preview_cursor(encode_preview_cursor(start_time, 1))
+    assert decoded_time.utcoffset() == start_time.utcoffset()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b'{"t": null}').decode(),
+        base64.urlsafe_b64encode(b'{"t": "yesterday", "id": 3}').decode(),
+        base64.urlsafe_b64encode(b'{"t": null, "id": "abc"}').decode(),
+        base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    ],
+)
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_preview_cursor(cursor)
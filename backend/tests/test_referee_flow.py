@@ -0,0 +1,113 @@
+import itertools
+import random
+from collections import Counter
+from datetime import datetime
+
+from worker.tasks.referee_flow import CHANGE_COST, LOAD_COST, solve_referee_assignment
+
+NINE = datetime(2026, 1, 5, 9, 0)
+TEN = datetime(2026, 1, 5, 10, 0)
+
+
+def test_single_match_gets_its_only_available_referee():
+    assert solve_referee_assignment([(1, 10, NINE, None)], {10: [7]}, {}) == {1: 7}
+
+
+def test_match_without_available_referee_stays_unassigned():
+    assert solve_referee_assignment([(1, 10, NINE, None)], {}, {}) == {}
+
+
+def test_infeasible_demand_covers_as_many_matches_as_referees():
+    # Three simultaneous matches, two referees available for all of them.
+    matches = [(1, 10, NINE, None), (2, 11, NINE, None), (3, 12, NINE, None)]
+    availability = {10: [7, 8], 11: [7, 8], 12: [7, 8]}
+
+    result = solve_referee_assignment(matches, availability, {})
+
+    assert len(result) == 2
+    assert sorted(result.values()) == [7, 8]
+
+
+def test_referee_covers_one_match_per_start_time():
+    matches = [(1, 10, NINE, None), (2, 11, NINE, None), (3, 12, TEN, None)]
+    availability = {10: [7], 11: [7], 12: [7]}
+
+    result = solve_referee_assignment(matches, availability, {})
+
+    assert result[3] == 7
+    assert len(result) == 2  # only one of the 9:00 matches
+
+
+def test_maximum_coverage_beats_preferences():
+    # Referee 7 currently has match 1, but only 7 can cover match 2 at the same time:
+    # keeping 7 on match 1 would leave match 2 without a referee.
+    matches = [(1, 10, NINE, 7), (2, 11, NINE, None)]
+    availability = {10: [7, 8], 11: [7]}
+
+    assert solve_referee_assignment(matches, availability, {}) == {1: 8, 2: 7}
+
+
+def test_tie_keeps_the_current_referee():
+    # Both referees are equally loaded: keeping the current one avoids a change.
+    matches = [(1, 10, NINE, 8)]
+    availability = {10: [7, 8]}
+
+    assert solve_referee_assignment(matches, availability, {}) == {1: 8}
+
+
+def test_load_balance_wins_over_keeping_the_current_referee():
+    # Referee 8 already has three matches elsewhere: moving the match to 7 balances the loads.
+    matches = [(1, 10, NINE, 8)]
+    availability = {10: [7, 8]}
+
+    assert solve_referee_assignment(matches, availability, {8: 3}) == {1: 7}
+
+
+def test_loads_are_spread_across_referees():
+    matches = [(match_id, 10 + match_id, hour, None) for match_id, hour in enumerate([NINE, TEN] * 2, start=1)]
+    availability = {slot_id: [7, 8] for slot_id in range(11, 15)}
+
+    result = solve_referee_assignment(matches, availability, {})
+
+    assert len(result) == 4
+    assert sorted(result.values()) == [7, 7, 8, 8]
+
+
+def _score(matches, base_load, result):
+    # (covered matches, -cost): the solver maximises coverage first, then minimises cost.
+    loads = Counter(result.values())
+    cost = sum(CHANGE_COST for match_id, _, _, current in matches if match_id in result and result[match_id] != current)
+    cost += sum(LOAD_COST * (base_load.get(referee_id, 0) + k) for referee_id, n in loads.items() for k in range(n))
+    return len(result), -cost
+
+
+def _brute_force_best(matches, availability, base_load):
+    best = None
+    options = [[None, *availability.get(slot_id, [])] for _, slot_id, _, _ in matches]
+    for picks in itertools.product(*options):
+        busy = [(referee_id, start) for referee_id, (_, _, start, _) in zip(picks, matches) if referee_id is not None]
+        if len(busy) != len(set(busy)):
+            continue
+        result = {match[0]: referee_id for referee_id, match in zip(picks, matches) if referee_id is not None}
+        score = _score(matches, base_load, result)
+        if best is None or score > best:
+            best = score
+    return best
+
+
+def test_matches_exhaustive_search_on_small_instances():
+    rng = random.Random(7)
+    for _ in range(60):
+        referees = list(range(1, rng.randint(2, 4) + 1))
+        matches = [
+            (match_id, match_id, rng.choice([NINE, TEN]), rng.choice([None, *referees]))
+            for match_id in range(1, rng.randint(1, 6) + 1)
+        ]
+        availability = {
+            match_id: rng.sample(referees, rng.randint(0, len(referees))) for match_id, _, _, _ in matches
+        }
+        base_load = {referee_id: rng.randint(0, 2) for referee_id in referees}
+
+        result = solve_referee_assignment(matches, availability, base_load)
+
+        assert _score(matches, base_load, result) == _brute_force_best(matches, availability, base_load)
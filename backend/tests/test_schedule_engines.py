@@ -0,0 +1,172 @@
+import random
+from datetime import datetime, timedelta
+from itertools import combinations
+
+import pytest
+
+from worker.tasks.schedule_engines import SCHEDULING_ENGINES, run_engine
+from worker.tasks.schedule_index import ScheduleIndex
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def _slots(days: int, courts: int, per_day: int) -> list[dict]:
+    slots = []
+    for day in range(days):
+        for court_id in range(1, courts + 1):
+            for position in range(per_day):
+                start = START + timedelta(days=day, hours=position)
+                slots.append(
+                    {"id": len(slots) + 1, "court_id": court_id, "start_time": start, "end_time": start + timedelta(hours=1)}
+                )
+    return slots
+
+
+def _league(team_count: int, shared_player: bool = True):
+    # Round-robin between team_count teams, three players per team; player 1000 plays for teams 1 and 2.
+    team_players = {team_id: {team_id * 10 + n for n in range(3)} for team_id in range(1, team_count + 1)}
+    if shared_player:
+        team_players[1].add(1000)
+        team_players[2].add(1000)
+    match_teams = {}
+    match_rounds = {}
+    for match_id, (home_id, away_id) in enumerate(combinations(range(1, team_count + 1), 2), start=1):
+        match_teams[match_id] = (home_id, away_id)
+        match_rounds[match_id] = (home_id + away_id) % (team_count - 1) + 1
+    return match_teams, team_players, match_rounds
+
+
+def _index(slots, match_teams, team_players, match_rounds=None, placements=()):
+    return ScheduleIndex(slots, list(placements), match_teams, team_players, match_rounds)
+
+
+def _assert_valid(slots: list[dict], placement: dict, match_teams: dict, team_players: dict):
+    """Check the hard constraints independently of ScheduleIndex."""
+    by_id = {slot["id"]: slot for slot in slots}
+    assert len(set(placement.values())) == len(placement), "two matches on one slot"
+    for (match_a, slot_a), (match_b, slot_b) in combinations(placement.items(), 2):
+        a, b = by_id[slot_a], by_id[slot_b]
+        teams_a, teams_b = set(match_teams[match_a]), set(match_teams[match_b])
+        if (a["start_time"], a["end_time"]) == (b["start_time"], b["end_time"]):
+            assert not teams_a & teams_b, f"team plays matches {match_a} and {match_b} at the same time"
+            players_a = set().union(*(team_players.get(t, set()) for t in teams_a))
+            players_b = set().union(*(team_players.get(t, set()) for t in teams_b))
+            assert not players_a & players_b, f"player plays matches {match_a} and {match_b} at the same time"
+        back_to_back = a["court_id"] == b["court_id"] and (
+            a["end_time"] == b["start_time"] or b["end_time"] == a["start_time"]
+        )
+        if back_to_back:
+            assert not teams_a & teams_b, f"team plays back to back in matches {match_a} and {match_b}"
+
+
+def test_index_rejects_slot_already_taken():
+    slots = _slots(1, 1, 3)
+    match_teams, team_players, _ = _league(4, shared_player=False)
+    index = _index(slots, match_teams, team_players, placements=[(1, 1)])
+
+    assert not index.can_place(6, 1)
+    assert index.conflicting_matches(6, 1) == {1}
+
+
+def test_index_rejects_team_back_to_back_on_same_court():
+    slots = _slots(1, 1, 3)
+    match_teams, team_players, _ = _league(4, shared_player=False)
+    index = _index(slots, match_teams, team_players, placements=[(1, 2)])  # teams 1-2 on the middle slot
+
+    assert not index.can_place(2, 1)  # teams 1-3 right before
+    assert not index.can_place(2, 3)  # and right after
+    assert index.can_place(6, 3)  # teams 3-4 are not involved
+    assert index.conflicting_matches(2, 3) == {1}
+
+
+def test_index_rejects_team_and_shared_player_at_the_same_time():
+    slots = _slots(1, 2, 1)  # two courts, same hour
+    match_teams, team_players, _ = _league(4)
+    index = _index(slots, match_teams, team_players, placements=[(1, 1)])  # teams 1-2
+
+    assert not index.can_place(2, 2)  # team 1 again
+    match_teams[7] = (3, 4)
+    team_players[4] = team_players[4] | {1000}  # player 1000 also plays for team 4
+    index = _index(slots, match_teams, team_players, placements=[(1, 1)])
+    assert not index.can_place(7, 2)
+    assert index.conflicting_matches(7, 2) == {1}
+
+
+def test_index_unplace_frees_slot_and_time():
+    slots = _slots(1, 2, 1)
+    match_teams, team_players, _ = _league(4)
+    index = _index(slots, match_teams, team_players, placements=[(1, 1)])
+
+    assert index.unplace(1) == 1
+    assert index.is_free(1)
+    assert index.can_place(2, 2)
+    assert index.unplace(1) is None
+
+
+@pytest.mark.parametrize("engine", sorted(SCHEDULING_ENGINES))
+def test_engine_schedules_every_match_within_constraints(engine):
+    random.seed(7)
+    slots = _slots(6, 2, 4)
+    match_teams, team_players, match_rounds = _league(6)
+    index = _index(slots, match_teams, team_players, match_rounds)
+    match_ids = sorted(match_teams)
+
+    result = run_engine(engine, index, match_ids, time_budget=10)
+
+    placement = dict(result["assignments"])
+    assert result["unscheduled"] == []
+    assert sorted(placement) == match_ids
+    assert placement == index.match_slot
+    _assert_valid(slots, placement, match_teams, team_players)
+
+
+@pytest.mark.parametrize("engine", sorted(SCHEDULING_ENGINES))
+def test_engine_is_deterministic_for_a_fixed_seed(engine):
+    slots = _slots(4, 2, 4)
+    match_teams, team_players, match_rounds = _league(6)
+    match_ids = sorted(match_teams)
+
+    results = []
+    for _ in range(2):
+        random.seed(42)
+        index = _index(slots, match_teams, team_players, match_rounds)
+        results.append(run_engine(engine, index, match_ids, time_budget=10))
+
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("engine", sorted(SCHEDULING_ENGINES))
+def test_engine_returns_valid_partial_schedule_when_slots_run_out(engine):
+    random.seed(3)
+    slots = _slots(1, 2, 2)  # 4 slots for 15 matches
+    match_teams, team_players, match_rounds = _league(6)
+    index = _index(slots, match_teams, team_players, match_rounds)
+    match_ids = sorted(match_teams)
+
+    result = run_engine(engine, index, match_ids, time_budget=0.2)
+
+    placement = dict(result["assignments"])
+    assert 0 < len(placement) <= len(slots)
+    assert sorted(list(placement) + result["unscheduled"]) == match_ids
+    _assert_valid(slots, placement, match_teams, team_players)
+
+
+def test_search_engine_keeps_existing_placements():
+    random.seed(11)
+    slots = _slots(4, 2, 4)
+    match_teams, team_players, match_rounds = _league(6)
+    fixed = {1: 1, 15: 9}
+    index = _index(slots, match_teams, team_players, match_rounds, placements=fixed.items())
+    match_ids = [match_id for match_id in sorted(match_teams) if match_id not in fixed]
+
+    result = run_engine("search", index, match_ids, time_budget=10)
+
+    assert all(index.match_slot[match_id] == slot_id for match_id, slot_id in fixed.items())
+    assert not {match_id for match_id, _ in result["assignments"]} & set(fixed)
+    _assert_valid(slots, index.match_slot, match_teams, team_players)
+
+
+def test_run_engine_rejects_unknown_engine():
+    index = _index(_slots(1, 1, 1), {}, {})
+    with pytest.raises(ValueError):
+        run_engine("unknown", index, [])
@@ -0,0 +1,48 @@
+import os
+import time
+from datetime import datetime, timezone
+
+from rq import get_current_job
+
+PROGRESS_INTERVAL_SECONDS = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "1"))
+
+
+class JobProgress:
+    """Structured progress stored in the current RQ job's meta["progress"], throttled to one
+    Redis write per PROGRESS_INTERVAL_SECONDS. Outside of an RQ job it only keeps the state."""
+
+    def __init__(self, total: int | None = None):
+        self.job = get_current_job()
+        self.started = time.monotonic()
+        self._last_saved = 0.0
+        self.placed_offset = 0
+        self.state = {"phase": "starting", "total": total, "placed": 0, "examined": 0}
+
+    def due(self) -> bool:
+        return self.job is not None and time.monotonic() - self._last_saved >= PROGRESS_INTERVAL_SECONDS
+
+    def update(self, force: bool = False, **fields):
+        self.state.update(fields)
+        if not force and not self.due():
+            return
+        if self.job is None:
+            return
+        now = time.monotonic()
+        self._last_saved = now
+        elapsed = now - self.started
+        self.job.meta["progress"] = {
+            **self.state,
+            "elapsed_seconds": round(elapsed, 2),
+            "placed_per_second": round(self.state["placed"] / elapsed, 2) if elapsed > 0 else 0.0,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.job.save_meta()
+
+    def phase(self, name: str, **fields):
+        self.update(force=True, phase=name, **fields)
+
+    def track_index(self, index, force: bool = False, **fields):
+        """Report the placements made in a ScheduleIndex since placed_offset was taken."""
+        if force or self.due():
+            placed = len(index.match_slot) - self.placed_offset
+            self.update(force=force, placed=placed, examined=index.checks, **fields)
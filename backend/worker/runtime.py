@@ -0,0 +1,63 @@
+import asyncio
+
+from helper.redis import close_async_redis, close_redis_clients
+from shared.db import close_async_pool, open_async_pool
+
+# Set by worker/worker.py: one event loop and one open DB pool reused by every job of the process.
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def start_runtime():
+    global _loop
+    if _loop is not None:
+        return
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _loop.run_until_complete(open_async_pool())
+
+
+def stop_runtime():
+    global _loop
+    if _loop is None:
+        return
+    try:
+        _loop.run_until_complete(close_async_pool())
+        _loop.run_until_complete(close_redis_clients())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
+        asyncio.set_event_loop(None)
+        _loop = None
+
+
+async def _run_with_pool(coro):
+    await open_async_pool()
+    try:
+        return await coro
+    finally:
+        await close_async_redis()
+        await close_async_pool()
+
+
+def _cancel_job_tasks(background: set):
+    # A job interrupted by an exception or RQ's timeout (SIGALRM raised out of run_until_complete)
+    # leaves its tasks pending on the loop, holding pool connections for the next job.
+    pending = [task for task in asyncio.all_tasks(_loop) if task not in background and not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        _loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+def run_job(coro):
+    """Run a job coroutine on the persistent loop, or in a fresh loop with its own pool when the
+    job is executed outside of worker/worker.py (e.g. a forking `rq worker` or a direct call)."""
+    if _loop is not None:
+        # Tasks already running (e.g. the replica lag monitor) belong to the runtime, not the job.
+        background = asyncio.all_tasks(_loop)
+        try:
+            return _loop.run_until_complete(coro)
+        except BaseException:
+            _cancel_job_tasks(background)
+            raise
+    return asyncio.run(_run_with_pool(coro))
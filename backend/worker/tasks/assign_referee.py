@@ -1,30 +1,41 @@
 from datetime import datetime, timedelta, timezone
 
-import asyncio
+from shared.cache import PREVIEWS_SCOPE, bump_versions, match_scope
+from shared.db import get_async_pool
+from shared.matches import MatchStatus
+from worker.runtime import run_job
+from worker.tasks.referee_flow import solve_referee_assignment
 
-from shared.db import close_async_pool, get_async_pool, open_async_pool
-from shared.matches import MatchStatus, update_match_status
+# A full run over 2000 matches, 300 referees and 30 candidates per slot solves in about 6 s
+# (helper/bench_referee_flow.py); the margin covers the reads, the write and slower hosts.
+REFEREE_JOB_TIMEOUT_SECONDS = 600
 
+_POSTPONABLE_STATUSES = (MatchStatus.SCHEDULED.value, MatchStatus.TBD.value)
 
-def run_assign_referees_for_slots(slot_ids: list[int] | None = None) -> list[dict]:
-    return asyncio.run(_run_assign_referees_for_slots(slot_ids))
 
+def run_assign_referees_for_slots(slot_ids: list[int] | None = None) -> dict:
+    return run_job(assign_referees_for_slots(slot_ids))
 
-async def _run_assign_referees_for_slots(slot_ids: list[int] | None = None) -> list[dict]:
-    await open_async_pool()
-    try:
-        return await assign_referees_for_slots(slot_ids)
-    finally:
-        await close_async_pool()
 
+def _empty_summary() -> dict:
+    return {
+        "postponed": 0,
+        "assigned": 0,
+        "removed": 0,
+        "unchanged": 0,
+        "unassigned": 0,
+        "assignments": [],
+    }
 
-async def assign_referees_for_slots(slot_ids: list[int] | None = None):
+
+async def _load_assignment_inputs(slot_ids: list[int] | None):
+    """Read the matches in scope, the slot availability and the referees' load outside the run."""
     pool = get_async_pool()
     async with pool.connection() as conn, conn.cursor() as cur:
         if slot_ids:
             await cur.execute(
                 """
-                SELECT m.id, ms.slot_id, s.start_time, mr.referee_id
+                SELECT m.id, ms.slot_id, s.start_time, m.status, mr.referee_id
                 FROM matches m
                 JOIN match_slot ms ON ms.match_id = m.id
                 JOIN slots s ON s.id = ms.slot_id
@@ -36,7 +47,7 @@ async def assign_referees_for_slots(slot_ids: list[int] | None = None):
         else:
             await cur.execute(
                 """
-                SELECT m.id, ms.slot_id, s.start_time, mr.referee_id
+                SELECT m.id, ms.slot_id, s.start_time, m.status, mr.referee_id
                 FROM matches m
                 JOIN match_slot ms ON ms.match_id = m.id
                 JOIN slots s ON s.id = ms.slot_id
@@ -44,81 +55,144 @@ async def assign_referees_for_slots(slot_ids: list[int] | None = None):
                 """
             )
         rows = await cur.fetchall()
-        if not rows:
-            return []
 
         now = datetime.now(timezone.utc)
         cutoff = now + timedelta(hours=24)
         eligible_matches: list[tuple[int, int, datetime, int | None]] = []
         lock_without_ref: list[int] = []
-        for match_id, slot_id, start_time, current_referee in rows:
+        seen_match_ids: set[int] = set()
+        for match_id, slot_id, start_time, status, current_referee in rows:
+            if match_id in seen_match_ids:
+                continue
+            seen_match_ids.add(match_id)
             if start_time <= cutoff:
-                if current_referee is None:
+                # Only upcoming matches are postponed: played or canceled ones keep their status.
+                if current_referee is None and status in _POSTPONABLE_STATUSES and start_time > now:
                     lock_without_ref.append(match_id)
                 continue
             eligible_matches.append((match_id, slot_id, start_time, current_referee))
 
-        for match_id in lock_without_ref:
-            await update_match_status(match_id, MatchStatus.POSTPONED)
-
-        slot_id_list = list({row[1] for row in eligible_matches})
-        if not slot_id_list:
-            return []
-        await cur.execute(
-            """
-            SELECT rd.slot_id, rd.referee_id
-            FROM ref_dispos rd
-            WHERE rd.slot_id = ANY(%s)
-            """,
-            (slot_id_list,),
-        )
-        availability_rows = await cur.fetchall()
         availability: dict[int, list[int]] = {}
-        for slot_id, referee_id in availability_rows:
-            availability.setdefault(slot_id, []).append(referee_id)
-
-        await cur.execute(
-            """
-            SELECT referee_id, COUNT(*)::int
-            FROM match_referees
-            GROUP BY referee_id
-            """
-        )
-        counts = {row[0]: row[1] for row in await cur.fetchall()}
-
-        assigned = []
-        for match_id, slot_id, _, current_referee in eligible_matches:
-            candidates = availability.get(slot_id, [])
-            if not candidates:
-                if current_referee is not None:
-                    await cur.execute(
-                        "DELETE FROM match_referees WHERE match_id = %s",
-                        (match_id,),
-                    )
-                continue
-            candidates.sort(key=lambda rid: (counts.get(rid, 0), rid))
-            chosen = candidates[0]
-            if current_referee == chosen:
-                continue
-            if current_referee is not None:
-                await cur.execute(
-                    "DELETE FROM match_referees WHERE match_id = %s",
-                    (match_id,),
-                )
-                counts[current_referee] = max(0, counts.get(current_referee, 1) - 1)
+        base_load: dict[int, int] = {}
+        slot_id_list = list({row[1] for row in eligible_matches})
+        if slot_id_list:
+            await cur.execute(
+                """
+                SELECT rd.slot_id, rd.referee_id
+                FROM ref_dispos rd
+                WHERE rd.slot_id = ANY(%s)
+                """,
+                (slot_id_list,),
+            )
+            for slot_id, referee_id in await cur.fetchall():
+                availability.setdefault(slot_id, []).append(referee_id)
+
+            await cur.execute(
+                """
+                SELECT referee_id, COUNT(*)::int
+                FROM match_referees
+                WHERE NOT (match_id = ANY(%s))
+                GROUP BY referee_id
+                """,
+                ([row[0] for row in eligible_matches],),
+            )
+            base_load = {row[0]: row[1] for row in await cur.fetchall()}
+        await conn.commit()
+    return eligible_matches, lock_without_ref, availability, base_load
+
+
+async def assign_referees_for_slots(slot_ids: list[int] | None = None) -> dict:
+    """Compute the full referee diff and apply it with bulk statements in one transaction.
+
+    The inputs are read and the connection released before solving, so no transaction stays open
+    during the solve; the write transaction then skips matches whose referee changed meanwhile.
+
+    Returns a summary: counts of postponed/assigned/removed/unchanged/unassigned matches, and
+    "assignments", the {"match_id", "referee_id"} rows written (the list returned before).
+    """
+    summary = _empty_summary()
+    eligible_matches, lock_without_ref, availability, base_load = await _load_assignment_inputs(slot_ids)
+    if not eligible_matches and not lock_without_ref:
+        return summary
+    chosen = solve_referee_assignment(eligible_matches, availability, base_load)
+
+    pool = get_async_pool()
+    async with pool.connection() as conn, conn.cursor() as cur:
+        # Only matches whose referee changes are touched; unchanged assignments stay as they are.
+        changed = {
+            match_id: current_referee
+            for match_id, _, _, current_referee in eligible_matches
+            if chosen.get(match_id) != current_referee
+        }
+        summary["unchanged"] = len(eligible_matches) - len(changed)
+        final_referees = {match_id: chosen.get(match_id) for match_id, _, _, _ in eligible_matches}
+        if changed:
+            await cur.execute(
+                """
+                SELECT m.id, mr.referee_id
+                FROM matches m
+                LEFT JOIN match_referees mr ON mr.match_id = m.id
+                WHERE m.id = ANY(%s)
+                ORDER BY m.id
+                FOR UPDATE OF m
+                """,
+                (list(changed),),
+            )
+            # A referee set by someone else since the read wins over this run's plan.
+            current = dict(await cur.fetchall())
+            for match_id, referee_id in list(changed.items()):
+                if current.get(match_id) != referee_id:
+                    del changed[match_id]
+                    final_referees[match_id] = current.get(match_id)
+        changed_match_ids = list(changed)
+        # Every match of the run that ends without a referee, whether or not this run changed it.
+        summary["unassigned"] = sum(1 for referee_id in final_referees.values() if referee_id is None)
+        new_rows = [(match_id, chosen[match_id]) for match_id in changed_match_ids if match_id in chosen]
+
+        if lock_without_ref:
+            await cur.execute(
+                """
+                UPDATE matches m
+                SET status = %s
+                WHERE m.id = ANY(%s)
+                  AND m.status = ANY(%s)
+                  AND NOT EXISTS (SELECT 1 FROM match_referees mr WHERE mr.match_id = m.id)
+                RETURNING m.id
+                """,
+                (MatchStatus.POSTPONED.value, lock_without_ref, list(_POSTPONABLE_STATUSES)),
+            )
+            lock_without_ref = [row[0] for row in await cur.fetchall()]
+            summary["postponed"] = len(lock_without_ref)
+        if changed_match_ids:
+            await cur.execute(
+                """
+                DELETE FROM match_referees
+                WHERE match_id = ANY(%s)
+                """,
+                (changed_match_ids,),
+            )
+            summary["removed"] = cur.rowcount
+        if new_rows:
             await cur.execute(
                 """
                 INSERT INTO match_referees (match_id, referee_id, role)
-                VALUES (%s, %s, %s)
+                SELECT a.match_id, a.referee_id, %s
+                FROM unnest(%s::int[], %s::int[]) AS a(match_id, referee_id)
                 ON CONFLICT DO NOTHING
                 RETURNING match_id, referee_id
                 """,
-                (match_id, chosen, "center"),
+                (
+                    "center",
+                    [match_id for match_id, _ in new_rows],
+                    [referee_id for _, referee_id in new_rows],
+                ),
             )
-            row = await cur.fetchone()
-            if row:
-                counts[chosen] = counts.get(chosen, 0) + 1
-                assigned.append({"match_id": row[0], "referee_id": row[1]})
-
+            summary["assignments"] = [
+                {"match_id": row[0], "referee_id": row[1]} for row in await cur.fetchall()
+            ]
+            summary["assigned"] = len(summary["assignments"])
         await conn.commit()
-        return assigned
+        touched = lock_without_ref + changed_match_ids
+        if touched:
+            await bump_versions(PREVIEWS_SCOPE, *(match_scope(match_id) for match_id in touched))
+        return summary
@@ -1,19 +1,17 @@
-import asyncio
-
 from shared.db import close_async_pool, get_async_pool, open_async_pool
-from shared.matches import MatchStatus, add_match, get_all_matches
+from shared.matches import MatchStatus, add_matches_bulk, get_match_pairs
 from shared.teams import get_all_valid_teams
+from worker.runtime import run_job
 
 
 def _pair_exists(existing_pairs: set[tuple[int, int]], team_a: int, team_b: int) -> bool:
     return (team_a, team_b) in existing_pairs or (team_b, team_a) in existing_pairs
 
 
-async def _get_existing_pairs() -> set[tuple[int, int]]:
-    existing = await get_all_matches()
+def _get_existing_pairs(matches: list[dict]) -> set[tuple[int, int]]:
     return {
         (m["home_team_id"], m["away_team_id"])
-        for m in existing
+        for m in matches
         if m.get("status") != MatchStatus.CANCELED.value
     }
 
@@ -26,53 +24,85 @@ def _group_by_division(teams: list[dict]) -> dict[int, list[int]]:
     return grouped
 
 
+def _circle_rounds(team_ids: list[int]) -> list[list[tuple[int, int]]]:
+    # Circle (Berger) method: the first seat stays fixed, the others rotate one seat per round.
+    # Every team plays at most once per round and gets floor/ceil((n-1)/2) home games with at
+    # most two home (or away) games in a row. With an odd count the bye takes the fixed seat,
+    # so every real team rotates and alternates like the others.
+    seats: list[int | None] = list(team_ids)
+    if len(seats) % 2:
+        seats.insert(0, None)
+    nbr_of_seats = len(seats)
+    rounds = []
+    for round_index in range(nbr_of_seats - 1):
+        pairs = []
+        for i in range(nbr_of_seats // 2):
+            team_a = seats[i]
+            team_b = seats[nbr_of_seats - 1 - i]
+            if team_a is None or team_b is None:
+                continue
+            a_is_home = round_index % 2 == 0 if i == 0 else i % 2 == 1
+            pairs.append((team_a, team_b) if a_is_home else (team_b, team_a))
+        rounds.append(pairs)
+        seats = [seats[0], seats[-1]] + seats[1:-1]
+    return rounds
+
+
+def _missing_pairs(
+    team_ids: list[int],
+    existing_pairs: set[tuple[int, int]],
+    first_round: int = 1,
+) -> tuple[list[tuple[int, int]], list[int]]:
+    pairs = []
+    round_numbers = []
+    for offset, round_pairs in enumerate(_circle_rounds(team_ids)):
+        for home_id, away_id in round_pairs:
+            if _pair_exists(existing_pairs, home_id, away_id):
+                continue
+            pairs.append((home_id, away_id))
+            round_numbers.append(first_round + offset)
+            existing_pairs.add((home_id, away_id))
+    return pairs, round_numbers
+
+
+def _last_round_by_division(matches: list[dict]) -> dict[int, int]:
+    last_round: dict[int, int] = {}
+    for m in matches:
+        if m.get("round_number") is not None:
+            last_round[m["division"]] = max(last_round.get(m["division"], 0), m["round_number"])
+    return last_round
+
+
 async def generate_matches():
     pool = get_async_pool()
     should_close = pool.closed
     if should_close:
         await open_async_pool()
     try:
+        existing = await get_match_pairs()
         teams = await get_all_valid_teams()
         if not teams:
-            return {"created": 0, "total": len(await get_all_matches())}
+            return {"created": 0, "total": len(existing)}
 
-        existing_pairs = await _get_existing_pairs()
+        existing_pairs = _get_existing_pairs(existing)
+        last_round = _last_round_by_division(existing)
         grouped = _group_by_division(teams)
         created_count = 0
 
+        # One multi-row insert per division instead of one round trip per pair.
+        # New rounds are numbered after the rounds already stored for the division.
         for division, team_ids in grouped.items():
             if len(team_ids) < 2:
                 continue
-            for i in range(len(team_ids)):
-                for j in range(i + 1, len(team_ids)):
-                    home_id = team_ids[i]
-                    away_id = team_ids[j]
-                    if _pair_exists(existing_pairs, home_id, away_id):
-                        continue
-                    created = await add_match(
-                        division=division,
-                        home_team_id=home_id,
-                        away_team_id=away_id,
-                        status=MatchStatus.TBD.value,
-                    )
-                    if created:
-                        existing_pairs.add((home_id, away_id))
-                        created_count += 1
-
-        total = len(await get_all_matches())
-        return {"created": created_count, "total": total}
+            pairs, round_numbers = _missing_pairs(team_ids, existing_pairs, last_round.get(division, 0) + 1)
+            created_ids = await add_matches_bulk(division, pairs, MatchStatus.TBD.value, round_numbers)
+            created_count += len(created_ids)
+
+        return {"created": created_count, "total": len(existing) + created_count}
     finally:
         if should_close:
             await close_async_pool()
 
 
 def run_generate_matches_job() -> dict:
-    return asyncio.run(_run_generate_matches_job())
-
-
-async def _run_generate_matches_job() -> dict:
-    await open_async_pool()
-    try:
-        return await generate_matches()
-    finally:
-        await close_async_pool()
+    return run_job(generate_matches())
@@ -0,0 +1,181 @@
+import heapq
+from collections import Counter
+
+# Costs are integers so the solver stays exact. Load dominates churn: a balanced
+# distribution is preferred, and among equally balanced ones the current referee is kept.
+LOAD_COST = 2
+CHANGE_COST = 1
+
+
+class _MinCostFlow:
+    def __init__(self):
+        self.graph: list[list[int]] = []
+        self.to: list[int] = []
+        self.cap: list[int] = []
+        self.cost: list[int] = []
+
+    def add_node(self) -> int:
+        self.graph.append([])
+        return len(self.graph) - 1
+
+    def add_edge(self, u: int, v: int, cap: int, cost: int) -> int:
+        edge = len(self.to)
+        self.graph[u].append(edge)
+        self.to.append(v)
+        self.cap.append(cap)
+        self.cost.append(cost)
+        self.graph[v].append(edge + 1)
+        self.to.append(u)
+        self.cap.append(0)
+        self.cost.append(-cost)
+        return edge
+
+    def solve(self, source: int, sink: int) -> int:
+        """Primal-dual min-cost flow for unit capacities (all initial costs are non-negative).
+
+        Each phase runs one Dijkstra (stopped once the sink is settled) to update the potentials,
+        then saturates every shortest path at once with a blocking flow over the zero reduced cost
+        edges. The number of phases is bounded by the number of distinct path costs, not the flow.
+        """
+        nbr_of_nodes = len(self.graph)
+        graph, to, cap, cost = self.graph, self.to, self.cap, self.cost
+        potential = [0] * nbr_of_nodes
+        flow = 0
+        while True:
+            dist = [None] * nbr_of_nodes
+            settled = [False] * nbr_of_nodes
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if settled[u]:
+                    continue
+                settled[u] = True
+                if u == sink:
+                    break
+                base = potential[u]
+                for edge in graph[u]:
+                    if cap[edge] <= 0:
+                        continue
+                    v = to[edge]
+                    if settled[v]:
+                        continue
+                    nd = d + cost[edge] + base - potential[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+            if not settled[sink]:
+                return flow
+            # Nodes not settled before the sink are at least as far: capping every shift at the
+            # sink distance keeps all residual reduced costs non-negative.
+            sink_dist = dist[sink]
+            for node in range(nbr_of_nodes):
+                if settled[node]:
+                    potential[node] += dist[node]
+                else:
+                    potential[node] += sink_dist
+            flow += self._blocking_flow(source, sink, potential)
+
+    def _blocking_flow(self, source: int, sink: int, potential: list[int]) -> int:
+        # Dinic on the admissible graph (residual edges with zero reduced cost), one unit per path.
+        graph, to, cap, cost = self.graph, self.to, self.cap, self.cost
+        flow = 0
+        while True:
+            level = [-1] * len(graph)
+            level[source] = 0
+            queue = [source]
+            for u in queue:
+                for edge in graph[u]:
+                    v = to[edge]
+                    if level[v] < 0 and cap[edge] > 0 and cost[edge] + potential[u] - potential[v] == 0:
+                        level[v] = level[u] + 1
+                        queue.append(v)
+            if level[sink] < 0:
+                return flow
+            next_edge = [0] * len(graph)
+            path: list[int] = []
+            u = source
+            while True:
+                if u == sink:
+                    for edge in path:
+                        cap[edge] -= 1
+                        cap[edge ^ 1] += 1
+                    flow += 1
+                    path.clear()
+                    u = source
+                    continue
+                edges = graph[u]
+                while next_edge[u] < len(edges):
+                    edge = edges[next_edge[u]]
+                    v = to[edge]
+                    if (
+                        cap[edge] > 0
+                        and level[v] == level[u] + 1
+                        and cost[edge] + potential[u] - potential[v] == 0
+                    ):
+                        break
+                    next_edge[u] += 1
+                if next_edge[u] < len(edges):
+                    path.append(edges[next_edge[u]])
+                    u = to[edges[next_edge[u]]]
+                    continue
+                # Dead end: retreat and skip the edge that led here.
+                if not path:
+                    break
+                edge = path.pop()
+                u = to[edge ^ 1]
+                next_edge[u] += 1
+
+
+def solve_referee_assignment(
+    matches: list[tuple[int, int, object, int | None]],
+    availability: dict[int, list[int]],
+    base_load: dict[int, int],
+) -> dict[int, int]:
+    """Assign at most one referee per match as a min-cost max-flow problem.
+
+    matches: (match_id, slot_id, start_time, current_referee) tuples.
+    availability: slot_id -> referees who declared the slot in ref_dispos.
+    base_load: referee_id -> matches already refereed outside this run.
+
+    A referee covers at most one match per start time, the number of covered matches is maximal,
+    and the k-th extra match of a referee costs LOAD_COST * (base_load + k) so loads stay balanced.
+    """
+    network = _MinCostFlow()
+    source = network.add_node()
+    sink = network.add_node()
+
+    referee_nodes: dict[int, int] = {}
+    time_nodes: dict[tuple[int, object], int] = {}
+    candidate_count = Counter()
+    match_edges: list[tuple[int, int, int]] = []
+
+    for match_id, slot_id, start_time, current_referee in matches:
+        candidates = availability.get(slot_id, [])
+        if not candidates:
+            continue
+        match_node = network.add_node()
+        network.add_edge(source, match_node, 1, 0)
+        for referee_id in set(candidates):
+            if referee_id not in referee_nodes:
+                referee_nodes[referee_id] = network.add_node()
+            key = (referee_id, start_time)
+            if key not in time_nodes:
+                time_nodes[key] = network.add_node()
+                network.add_edge(time_nodes[key], referee_nodes[referee_id], 1, 0)
+            cost = 0 if referee_id == current_referee else CHANGE_COST
+            edge = network.add_edge(match_node, time_nodes[key], 1, cost)
+            match_edges.append((edge, match_id, referee_id))
+            candidate_count[referee_id] += 1
+
+    for referee_id, referee_node in referee_nodes.items():
+        load = base_load.get(referee_id, 0)
+        for k in range(candidate_count[referee_id]):
+            network.add_edge(referee_node, sink, 1, LOAD_COST * (load + k))
+
+    network.solve(source, sink)
+    return {
+        match_id: referee_id
+        for edge, match_id, referee_id in match_edges
+        if network.cap[edge] == 0
+    }
@@ -0,0 +1,206 @@
+import os
+import random
+import time
+from collections import Counter, deque
+
+from worker.tasks.schedule_index import ScheduleIndex
+
+DEFAULT_TIME_BUDGET_SECONDS = float(os.getenv("SCHEDULER_TIME_BUDGET_SECONDS", "60"))
+SEARCH_SAMPLE_SIZE = 64
+TABU_TENURE = 10
+
+
+def greedy_engine(index: ScheduleIndex, match_ids: list[int], deadline: float, progress=None) -> dict:
+    """First feasible slot in random order, one pass over the matches (baseline)."""
+    free_slots = index.free_slots()
+    random.shuffle(free_slots)
+    unscheduled = []
+    for match_id in match_ids:
+        if progress is not None:
+            progress.track_index(index)
+        if time.monotonic() >= deadline:
+            unscheduled.append(match_id)
+            continue
+        for position, slot_id in enumerate(free_slots):
+            if index.can_place(match_id, slot_id):
+                index.place(match_id, slot_id)
+                del free_slots[position]
+                break
+        else:
+            unscheduled.append(match_id)
+    return {
+        "assignments": [(mid, index.match_slot[mid]) for mid in match_ids if mid in index.match_slot],
+        "unscheduled": unscheduled,
+    }
+
+
+def _order_by_difficulty(index: ScheduleIndex, match_ids: list[int]) -> list[int]:
+    # Matches of busy teams and with many players have the fewest feasible slots: place them first.
+    team_load = Counter()
+    for match_id in match_ids:
+        team_load.update(index.match_teams[match_id])
+    return sorted(
+        match_ids,
+        key=lambda mid: (
+            -(team_load[index.match_teams[mid][0]] + team_load[index.match_teams[mid][1]]),
+            -len(index.match_players(mid)),
+            mid,
+        ),
+    )
+
+
+def search_engine(index: ScheduleIndex, match_ids: list[int], deadline: float, progress=None) -> dict:
+    """Most-constrained-first construction followed by min-conflicts repair under a wall-clock deadline.
+
+    Only matches from match_ids can be moved; matches already placed before the run stay fixed.
+    Returns the best (most complete) schedule found when the deadline is reached.
+    """
+    movable = set(match_ids)
+    all_slots = list(index.slots)
+    free_slots = index.free_slots()
+    random.shuffle(free_slots)
+
+    pending = deque()
+    for match_id in _order_by_difficulty(index, match_ids):
+        if progress is not None:
+            progress.track_index(index)
+        if time.monotonic() >= deadline:
+            pending.append(match_id)
+            continue
+        for position, slot_id in enumerate(free_slots):
+            if index.can_place(match_id, slot_id):
+                index.place(match_id, slot_id)
+                del free_slots[position]
+                break
+        else:
+            pending.append(match_id)
+
+    best = {mid: index.match_slot[mid] for mid in match_ids if mid in index.match_slot}
+    if progress is not None:
+        progress.phase("repair", pending=len(pending))
+    tabu: dict[int, int] = {}
+    iteration = 0
+    while pending and time.monotonic() < deadline:
+        iteration += 1
+        if progress is not None:
+            progress.track_index(index, pending=len(pending), best_placed=len(best), iterations=iteration)
+        match_id = pending.popleft()
+        sample = random.sample(all_slots, min(SEARCH_SAMPLE_SIZE, len(all_slots)))
+
+        chosen_slot = None
+        chosen_conflicts = None
+        for slot_id in sample:
+            conflicts = index.conflicting_matches(match_id, slot_id)
+            if not conflicts:
+                chosen_slot, chosen_conflicts = slot_id, conflicts
+                break
+            if not conflicts <= movable:
+                continue
+            if any(tabu.get(other, 0) > iteration for other in conflicts):
+                continue
+            if chosen_conflicts is None or len(conflicts) < len(chosen_conflicts):
+                chosen_slot, chosen_conflicts = slot_id, conflicts
+
+        if chosen_slot is None:
+            pending.append(match_id)
+            continue
+
+        for other_id in chosen_conflicts:
+            index.unplace(other_id)
+            pending.append(other_id)
+        index.place(match_id, chosen_slot)
+        tabu[match_id] = iteration + TABU_TENURE
+
+        placed = len(match_ids) - len(pending)
+        if placed > len(best):
+            best = {mid: index.match_slot[mid] for mid in match_ids if mid in index.match_slot}
+
+    if len(best) > len(match_ids) - len(pending):
+        for match_id in match_ids:
+            index.unplace(match_id)
+        for match_id, slot_id in best.items():
+            index.place(match_id, slot_id)
+
+    return {
+        "assignments": [(mid, index.match_slot[mid]) for mid in match_ids if mid in index.match_slot],
+        "unscheduled": [mid for mid in match_ids if mid not in index.match_slot],
+    }
+
+
+def rounds_engine(index: ScheduleIndex, match_ids: list[int], deadline: float, progress=None) -> dict:
+    """Place whole generator rounds on consecutive match days, then hand leftovers to the search engine.
+
+    A round never has a team twice, so a round usually fits in one day and the work is proportional
+    to the number of rounds rather than to the number of pairs.
+    """
+    days: dict = {}
+    for slot_id in index.free_slots():
+        slot = index.slots[slot_id]
+        days.setdefault(slot["start_time"].date(), []).append(slot_id)
+    ordered_days = [
+        sorted(days[day], key=lambda sid: (index.slots[sid]["start_time"], index.slots[sid]["court_id"]))
+        for day in sorted(days)
+    ]
+
+    by_round: dict[int, list[int]] = {}
+    leftovers = []
+    for match_id in match_ids:
+        round_number = index.match_rounds.get(match_id)
+        if round_number is None:
+            leftovers.append(match_id)
+        else:
+            by_round.setdefault(round_number, []).append(match_id)
+
+    day_position = 0
+    for round_number in sorted(by_round):
+        if progress is not None:
+            progress.track_index(index, round=round_number)
+        remaining = by_round[round_number]
+        while remaining and day_position < len(ordered_days) and time.monotonic() < deadline:
+            day_slots = ordered_days[day_position]
+            not_placed = []
+            for match_id in remaining:
+                for position, slot_id in enumerate(day_slots):
+                    if index.can_place(match_id, slot_id):
+                        index.place(match_id, slot_id)
+                        del day_slots[position]
+                        break
+                else:
+                    not_placed.append(match_id)
+            remaining = not_placed
+            day_position += 1
+        leftovers.extend(remaining)
+
+    if leftovers:
+        search_engine(index, leftovers, deadline, progress)
+    return {
+        "assignments": [(mid, index.match_slot[mid]) for mid in match_ids if mid in index.match_slot],
+        "unscheduled": [mid for mid in match_ids if mid not in index.match_slot],
+    }
+
+
+SCHEDULING_ENGINES = {
+    "greedy": greedy_engine,
+    "search": search_engine,
+    "rounds": rounds_engine,
+}
+
+
+def run_engine(
+    engine: str,
+    index: ScheduleIndex,
+    match_ids: list[int],
+    time_budget: float | None = None,
+    progress=None,
+) -> dict:
+    if engine not in SCHEDULING_ENGINES:
+        raise ValueError(f"Unknown scheduling engine: {engine}")
+    budget = DEFAULT_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    deadline = time.monotonic() + budget
+    if progress is not None:
+        progress.placed_offset = len(index.match_slot)
+        progress.phase("construct", engine=engine, total=len(match_ids), time_budget_seconds=budget)
+    result = SCHEDULING_ENGINES[engine](index, match_ids, deadline, progress)
+    if progress is not None:
+        progress.track_index(index, force=True)
+    return result
@@ -0,0 +1,138 @@
+from collections import Counter, defaultdict
+
+
+class ScheduleIndex:
+    """In-memory occupancy index used to evaluate the scheduling rules without SQL probes.
+
+    Rules (same as shared/slots.py):
+    1. A team cannot play in the slot right before or right after one of its matches on the same court.
+    2. A team cannot play in two matches at the same time.
+    3. A player cannot play in two matches at the same time (players can belong to several teams).
+    """
+
+    def __init__(self, slots, placements, match_teams, team_players, match_rounds=None):
+        self.slots = {slot["id"]: slot for slot in slots}
+        self.match_teams = match_teams
+        self.team_players = team_players
+        self.match_rounds = match_rounds or {}
+
+        self.court_slots = defaultdict(list)
+        self._slot_by_court_start = {}
+        self._slot_by_court_end = {}
+        for slot in sorted(slots, key=lambda s: (s["court_id"], s["start_time"])):
+            self.court_slots[slot["court_id"]].append(slot["id"])
+            self._slot_by_court_start[(slot["court_id"], slot["start_time"])] = slot["id"]
+            self._slot_by_court_end[(slot["court_id"], slot["end_time"])] = slot["id"]
+
+        self.slot_match = {}
+        self.match_slot = {}
+        self._time_teams = defaultdict(Counter)
+        self._time_players = defaultdict(Counter)
+        self._time_matches = defaultdict(set)
+        self._match_players_cache = {}
+        self.checks = 0
+
+        for match_id, slot_id in placements:
+            if slot_id in self.slots and match_id in self.match_teams:
+                self.place(match_id, slot_id)
+
+    @staticmethod
+    def _time_key(slot):
+        return slot["start_time"], slot["end_time"]
+
+    def match_players(self, match_id):
+        players = self._match_players_cache.get(match_id)
+        if players is None:
+            home_id, away_id = self.match_teams[match_id]
+            players = self.team_players.get(home_id, set()) | self.team_players.get(away_id, set())
+            self._match_players_cache[match_id] = players
+        return players
+
+    def neighbour_slots(self, slot_id):
+        slot = self.slots[slot_id]
+        previous_id = self._slot_by_court_end.get((slot["court_id"], slot["start_time"]))
+        next_id = self._slot_by_court_start.get((slot["court_id"], slot["end_time"]))
+        return [sid for sid in (previous_id, next_id) if sid is not None]
+
+    def is_free(self, slot_id):
+        return slot_id not in self.slot_match
+
+    def free_slots(self):
+        return [slot_id for slot_id in self.slots if slot_id not in self.slot_match]
+
+    def is_back_to_back_possible(self, slot_id, match_id):
+        teams = self.match_teams[match_id]
+        for neighbour_id in self.neighbour_slots(slot_id):
+            neighbour_match = self.slot_match.get(neighbour_id)
+            if neighbour_match is None or neighbour_match == match_id:
+                continue
+            neighbour_teams = self.match_teams[neighbour_match]
+            if teams[0] in neighbour_teams or teams[1] in neighbour_teams:
+                return False
+        return True
+
+    def is_parallel_possible(self, slot_id, match_id):
+        key = self._time_key(self.slots[slot_id])
+        busy_teams = self._time_teams.get(key)
+        if busy_teams:
+            home_id, away_id = self.match_teams[match_id]
+            if busy_teams[home_id] or busy_teams[away_id]:
+                return False
+        busy_players = self._time_players.get(key)
+        if busy_players:
+            for player_id in self.match_players(match_id):
+                if busy_players[player_id]:
+                    return False
+        return True
+
+    def can_place(self, match_id, slot_id):
+        self.checks += 1
+        return (
+            self.is_free(slot_id)
+            and self.is_back_to_back_possible(slot_id, match_id)
+            and self.is_parallel_possible(slot_id, match_id)
+        )
+
+    def place(self, match_id, slot_id):
+        key = self._time_key(self.slots[slot_id])
+        self.slot_match[slot_id] = match_id
+        self.match_slot[match_id] = slot_id
+        self._time_teams[key].update(self.match_teams[match_id])
+        self._time_players[key].update(self.match_players(match_id))
+        self._time_matches[key].add(match_id)
+
+    def unplace(self, match_id):
+        slot_id = self.match_slot.pop(match_id, None)
+        if slot_id is None:
+            return None
+        key = self._time_key(self.slots[slot_id])
+        del self.slot_match[slot_id]
+        self._time_teams[key].subtract(self.match_teams[match_id])
+        self._time_players[key].subtract(self.match_players(match_id))
+        self._time_matches[key].discard(match_id)
+        return slot_id
+
+    def conflicting_matches(self, match_id, slot_id):
+        """Return the placed matches that prevent match_id from being placed on slot_id."""
+        self.checks += 1
+        conflicts = set()
+        occupant = self.slot_match.get(slot_id)
+        if occupant is not None and occupant != match_id:
+            conflicts.add(occupant)
+        home_id, away_id = self.match_teams[match_id]
+        for neighbour_id in self.neighbour_slots(slot_id):
+            neighbour_match = self.slot_match.get(neighbour_id)
+            if neighbour_match is None or neighbour_match == match_id:
+                continue
+            if home_id in self.match_teams[neighbour_match] or away_id in self.match_teams[neighbour_match]:
+                conflicts.add(neighbour_match)
+        players = self.match_players(match_id)
+        for other_id in self._time_matches.get(self._time_key(self.slots[slot_id]), ()):
+            if other_id == match_id:
+                continue
+            other_teams = self.match_teams[other_id]
+            if home_id in other_teams or away_id in other_teams:
+                conflicts.add(other_id)
+            elif not players.isdisjoint(self.match_players(other_id)):
+                conflicts.add(other_id)
+        return conflicts
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import random
 from datetime import datetime, timedelta, timezone, date
@@ -14,25 +13,90 @@ from shared.matches import (
     clear_match_slots_for_matches,
     MatchStatus,
     schedule_match,
+    schedule_matches_bulk,
     get_match_details,
     get_home_and_away_teams_from_match_id,
 )
-from shared.courts import add_court, generate_slots, get_all_courts
+from shared.courts import add_court, generate_slots_bulk, get_all_courts
 from shared.venues import add_venue
 from shared.teams import create_team, add_player
-from shared.slots import get_all_slots, are_both_next_slots_possible, are_parallel_matches_possible
-from shared.db import close_async_pool, open_async_pool
+from shared.slots import (
+    get_all_slots,
+    are_both_next_slots_possible,
+    are_parallel_matches_possible,
+    load_schedule_snapshot,
+)
+from worker.progress import JobProgress
+from worker.runtime import run_job
+from worker.tasks.schedule_engines import DEFAULT_TIME_BUDGET_SECONDS, SCHEDULING_ENGINES, run_engine
+from worker.tasks.schedule_index import ScheduleIndex
 
 logger = logging.getLogger(__name__)
 
 
-def run_scheduler_job() -> dict:
-    return asyncio.run(_run_scheduler_job())
-
-
-async def _run_scheduler_job() -> None:
-    await open_async_pool()
+SCHEDULER_MODES = ("indexed", "probe")
+# Loading, slot generation and saving on top of the engine's time budget.
+SCHEDULER_JOB_OVERHEAD_SECONDS = 180
+
+
+def scheduler_job_options(mode: str, engine: str, time_budget: float | None) -> dict:
+    """Validate the scheduler options and return the matching queue.enqueue kwargs."""
+    if mode not in SCHEDULER_MODES:
+        raise ValueError(f"Unknown scheduler mode: {mode}")
+    if engine not in SCHEDULING_ENGINES:
+        raise ValueError(f"Unknown scheduling engine: {engine}")
+    if time_budget is not None and time_budget <= 0:
+        raise ValueError("time_budget must be positive")
+    budget = DEFAULT_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    return {"args": (mode, engine, time_budget), "job_timeout": int(budget) + SCHEDULER_JOB_OVERHEAD_SECONDS}
+
+
+def run_scheduler_job(
+    mode: str = "indexed",
+    engine: str = "rounds",
+    time_budget: float | None = None,
+) -> dict:
+    return run_job(_run_scheduler_job(mode, engine, time_budget))
+
+
+async def _schedule_with_index(
+    matches: list[dict],
+    engine: str,
+    time_budget: float | None,
+    progress: JobProgress | None = None,
+) -> dict:
+    # Same rules as the probe loop below, evaluated against an in-memory snapshot.
+    if progress is not None:
+        progress.phase("loading_snapshot")
+    snapshot = await load_schedule_snapshot()
+    index = ScheduleIndex(
+        snapshot["slots"],
+        snapshot["placements"],
+        snapshot["match_teams"],
+        snapshot["team_players"],
+        snapshot["match_rounds"],
+    )
+    if not index.free_slots():
+        raise Exception("NO MORE SLOTS AVAILABLE !!")
+
+    match_ids = [match["id"] for match in reversed(matches) if match["id"] in index.match_teams]
+    result = run_engine(engine, index, match_ids, time_budget, progress)
+    if progress is not None:
+        progress.phase("saving", unscheduled=len(result["unscheduled"]))
+    scheduled_count = await schedule_matches_bulk(result["assignments"])
+    return {"scheduled": scheduled_count, "unscheduled": result["unscheduled"]}
+
+
+async def _run_scheduler_job(
+    mode: str = "indexed",
+    engine: str = "rounds",
+    time_budget: float | None = None,
+) -> dict:
+    if mode not in SCHEDULER_MODES:
+        raise ValueError(f"Unknown scheduler mode: {mode}")
+    progress = JobProgress()
     try:
+        progress.phase("loading_matches", mode=mode)
         all_matches = await get_all_matches()
         all_unscheduled_matches = [
             match
@@ -65,8 +129,8 @@ async def _run_scheduler_job() -> None:
         season_start_date = current_date + timedelta(days=7)
         season_end_date = season_start_date + timedelta(days=minimum_number_of_match_days)
 
-        for court in all_courts:
-            proceed = await generate_slots(court["id"], season_start_date, season_end_date)
+        progress.phase("generating_slots", total=nbr_of_matches)
+        await generate_slots_bulk([court["id"] for court in all_courts], season_start_date, season_end_date)
         
         # Schedule
         # Going to change the system.
@@ -76,8 +140,22 @@ async def _run_scheduler_job() -> None:
         # 1. Once a team has played a match, they can't play in the immediate next one. => verif_1
         # 2. Teleportation is authorized. I player can play the very next match slot in another venue. => verif_2
         # 3. A team cannot play in two seperate matches at the same time. => verif_2
-        
+
+        if mode == "indexed":
+            # Engines return the best partial schedule found within the time budget instead of failing.
+            result = await _schedule_with_index(all_unscheduled_matches, engine, time_budget, progress)
+            if result["unscheduled"]:
+                logger.warning("%s matches could not be scheduled", len(result["unscheduled"]))
+            progress.phase("done", placed=result["scheduled"], unscheduled=len(result["unscheduled"]))
+            return {
+                "scheduled": result["scheduled"],
+                "unscheduled": len(result["unscheduled"]),
+                "engine": engine,
+            }
+
+        progress.phase("probing")
         scheduled_count = 0
+        examined = 0
         for current_match in list(reversed(all_unscheduled_matches)): # Goes through all the matches from the end,
                                                             # so when we remove one, it doesn't do anything unexpected.
                                                             # It will only reiterate once a valid slot is found for the
@@ -91,6 +169,8 @@ async def _run_scheduler_job() -> None:
             slots_iterator = 0
             while slots_iterator < len(all_current_available_slots):
                 slot = all_current_available_slots[slots_iterator]                  # selects slot
+                examined += 1
+                progress.update(placed=scheduled_count, examined=examined)
                 verif_1 = await are_both_next_slots_possible(slot, teams[0], teams[1]) # checks if next_slot and previous_slot don't contain either a match or a match, where one of the teams is playing
                 verif_2 = await are_parallel_matches_possible(slot, teams[0], teams[1])  # checks if no parallel match is played by our team and checks if player none of the players are playing in a match that is at the same time.
 
@@ -108,7 +188,9 @@ async def _run_scheduler_job() -> None:
         if len(all_unscheduled_matches) != 0:
             raise Exception("SOME MATCHES WERE NOT SCHEDULED !!") # not good.
 
-        print("This is the end of ze schedluation my friend.")
+        progress.phase("done", placed=scheduled_count, examined=examined)
         return {"scheduled": scheduled_count}
-    finally:
-        await close_async_pool()
+    except Exception:
+        # Leave the failure visible in the status endpoint, not the last phase reached.
+        progress.phase("failed")
+        raise
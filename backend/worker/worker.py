@@ -1,18 +1,22 @@
-import os
+from rq import Queue, SimpleWorker
 
-from redis import Redis
-from rq import Connection, Queue, Worker
+from helper.redis import get_sync_redis
+from worker.runtime import start_runtime, stop_runtime
 
 
-def _get_redis_url() -> str:
-    url = os.getenv("REDIS_URL")
-    if not url:
-        raise RuntimeError("REDIS_URL is not set")
-    return url
+class AsyncRuntimeWorker(SimpleWorker):
+    """Runs jobs in the worker process itself (no fork per job) so the event loop and the
+    DB pool opened by start_runtime stay warm from one job to the next."""
+
+    def work(self, *args, **kwargs):
+        start_runtime()
+        try:
+            return super().work(*args, **kwargs)
+        finally:
+            stop_runtime()
 
 
 if __name__ == "__main__":
-    redis_conn = Redis.from_url(_get_redis_url())
-    with Connection(redis_conn):
-        worker = Worker([Queue("scheduler")])
-        worker.work()
+    redis_conn = get_sync_redis()
+    worker = AsyncRuntimeWorker([Queue("scheduler", connection=redis_conn)], connection=redis_conn)
+    worker.work()
@@ -0,0 +1,5 @@
+ALTER TABLE matches
+ADD COLUMN IF NOT EXISTS round_number INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_matches_division_round
+    ON matches(division, round_number);
@@ -0,0 +1,41 @@
+-- Rankings are maintained incrementally on match finalization (one row per team).
+ALTER TABLE ranking
+    ADD COLUMN IF NOT EXISTS played        INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS wins          INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS draws         INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS losses        INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS goals_for     INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS goals_against INTEGER NOT NULL DEFAULT 0;
+
+-- Rebuild from finished matches so every team has exactly one complete row.
+DELETE FROM ranking;
+
+INSERT INTO ranking (team_id, goal_diff, points, played, wins, draws, losses, goals_for, goals_against)
+SELECT t.id,
+       COALESCE(SUM(r.goals_for - r.goals_against), 0),
+       COALESCE(SUM(CASE WHEN r.goals_for > r.goals_against THEN 3
+                         WHEN r.goals_for = r.goals_against THEN 1
+                         ELSE 0 END), 0),
+       COUNT(r.team_id),
+       COUNT(r.team_id) FILTER (WHERE r.goals_for > r.goals_against),
+       COUNT(r.team_id) FILTER (WHERE r.goals_for = r.goals_against),
+       COUNT(r.team_id) FILTER (WHERE r.goals_for < r.goals_against),
+       COALESCE(SUM(r.goals_for), 0),
+       COALESCE(SUM(r.goals_against), 0)
+FROM teams t
+LEFT JOIN (
+    SELECT home_team_id AS team_id,
+           COALESCE(home_score, 0) AS goals_for,
+           COALESCE(away_score, 0) AS goals_against
+    FROM matches
+    WHERE status = 'finished'
+    UNION ALL
+    SELECT away_team_id,
+           COALESCE(away_score, 0),
+           COALESCE(home_score, 0)
+    FROM matches
+    WHERE status = 'finished'
+) r ON r.team_id = t.id
+GROUP BY t.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ranking_team ON ranking(team_id);
@@ -0,0 +1,3 @@
+-- Keyset pagination of match previews on (scheduled_start_time, id).
+CREATE INDEX IF NOT EXISTS idx_matches_start_time_id
+    ON matches(scheduled_start_time, id);